@@ -0,0 +1,116 @@
+"""Batch decoder benchmark for the tetraconnect integration.
+
+Decode a generated corpus of short location reports with the scalar decoder and the
+vectorized batch decoder, check that both produce identical results and compare
+their throughput.
+
+Needs an environment with Home Assistant and numpy installed, run from the
+repository root:
+    python benchmarks/batch_decoder.py [--count 100000]
+
+"""
+
+import argparse
+import math
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect.batch import decode_location_reports
+from custom_components.tetraconnect.decoders import DecoderSink
+from custom_components.tetraconnect.motorola import Motorola
+
+# fields compared between scalar and batch decoder, batch names if different
+FIELDS = {
+    "pdu_type": "pdu_type",
+    "time_elapsed": "time_elapsed_desc",
+    "lng": "lng",
+    "lat": "lat",
+    "position_error": "position_error_desc",
+    "velocity": "velocity",
+    "direction": "direction_desc",
+    "type_additional_data_desc": "type_additional_data_desc",
+    "reason_sending": "reason_sending",
+    "reason_sending_desc": "reason_sending_desc",
+    "user_defined_data": "user_defined_data",
+}
+
+
+class _NullSink(DecoderSink):
+    """Discard decoded records."""
+
+    def put(self, key, message) -> None:
+        """Discard the record."""
+
+
+def build_corpus(count: int, seed: int = 10) -> list[str]:
+    """Return random short location report payloads incl. SDS type 0A.
+
+    Every field value is reached, including negative coordinates and unknown
+    velocities. Payloads have the 84 bits of the report and 4 bits of padding.
+
+    """
+    rng = random.Random(seed)
+    return [f"0A{rng.getrandbits(88):022X}" for _ in range(count)]
+
+
+def decode_scalar(payloads: list[str]) -> list:
+    """Decode all payloads with the scalar decoder, all fields are accessed."""
+    decoder = Motorola(_NullSink("Motorola"))
+    records = []
+    for index, payload in enumerate(payloads):
+        record = decoder.decode_message(
+            f"+CTSDSR,108,{index},0,1000,0,{len(payload) * 4},{payload}"
+        )
+        records.append([record[field] for field in FIELDS])
+    return records
+
+
+def compare(payloads: list[str], records: list, batch: dict) -> int:
+    """Return the number of payloads decoded differently."""
+    mismatches = 0
+    for index, record in enumerate(records):
+        for scalar, name in zip(record, FIELDS.values()):
+            value = batch[name][index]
+            if scalar == "unknown" and name == "velocity":
+                same = math.isnan(value)
+            else:
+                same = scalar == value
+            if not same:
+                mismatches += 1
+                print(f"Mismatch {payloads[index]} {name}: {scalar!r} != {value!r}")
+                break
+    return mismatches
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    payloads = build_corpus(args.count)
+
+    started = time.perf_counter()
+    records = decode_scalar(payloads)
+    scalar = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = decode_location_reports(payloads)
+    vectorized = time.perf_counter() - started
+
+    mismatches = compare(payloads, records, batch)
+    print(f"Payloads:   {args.count}")
+    print(f"Scalar:     {scalar * 1000:.1f} ms ({args.count / scalar:,.0f}/s)")
+    print(f"Batch:      {vectorized * 1000:.1f} ms ({args.count / vectorized:,.0f}/s)")
+    print(f"Speedup:    {scalar / vectorized:.1f}x")
+    print(f"Mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
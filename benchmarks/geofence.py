@@ -0,0 +1,133 @@
+"""Geofence benchmark for the tetraconnect integration.
+
+Index random geofences around a city, run random walks of ISSIs through them and
+measure the cost per location report. The result is checked against a linear scan
+of all geofences, the load is given for a rate of location reports per second.
+
+Needs an environment with Home Assistant installed, run from the repository root:
+    python benchmarks/geofence.py [--fences 10000] [--reports 100000] [--rate 1000]
+
+"""
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect.geofence import (
+    Geofence,
+    TetraGeofences,
+    haversine,
+)
+
+CENTER = (51.05, 13.74)  # fences and ISSIs are spread around this point
+SPREAD = 0.25  # Maximum distance in degrees from the center
+ISSIS = 1000
+
+
+class _Bus:
+    """Count fired events."""
+
+    def __init__(self) -> None:
+        """Initialize the bus."""
+        self.events = 0
+
+    def async_fire(self, event_type, event_data) -> None:
+        """Count the event."""
+        self.events += 1
+
+
+class _Hass:
+    """HA instance offering the event bus only."""
+
+    def __init__(self) -> None:
+        """Initialize the HA stand-in."""
+        self.bus = _Bus()
+
+
+def build_fences(count: int, rng: random.Random) -> list[Geofence]:
+    """Return random geofences, mostly small and a few district sized ones."""
+    return [
+        Geofence(
+            f"fence {index}",
+            CENTER[0] + rng.uniform(-SPREAD, SPREAD),
+            CENTER[1] + rng.uniform(-SPREAD, SPREAD),
+            rng.choice((50, 100, 200, 500, 1000)) if index % 1000 else 5000,
+        )
+        for index in range(count)
+    ]
+
+
+def build_reports(count: int, rng: random.Random) -> list[dict]:
+    """Return location reports of ISSIs moving randomly."""
+    positions = [
+        [
+            CENTER[0] + rng.uniform(-SPREAD, SPREAD),
+            CENTER[1] + rng.uniform(-SPREAD, SPREAD),
+        ]
+        for _ in range(ISSIS)
+    ]
+    reports = []
+    for _ in range(count):
+        issi = rng.randrange(ISSIS)
+        position = positions[issi]
+        position[0] += rng.uniform(-0.002, 0.002)
+        position[1] += rng.uniform(-0.002, 0.002)
+        reports.append({"issi_sen": str(issi), "lat": position[0], "lng": position[1]})
+    return reports
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--fences", type=int, default=10000)
+    parser.add_argument("--reports", type=int, default=100000)
+    parser.add_argument("--rate", type=int, default=1000, help="reports per second")
+    args = parser.parse_args()
+
+    rng = random.Random(37)
+    fences = build_fences(args.fences, rng)
+    reports = build_reports(args.reports, rng)
+
+    hass = _Hass()
+    geofences = TetraGeofences(hass)
+    started = time.perf_counter()
+    geofences.index(fences)
+    indexing = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for report in reports:
+        geofences.update(report)
+    elapsed = time.perf_counter() - started
+    per_report = elapsed / args.reports
+
+    mismatches = 0
+    for report in reports[:1000]:
+        expected = {
+            index
+            for index, fence in enumerate(fences)
+            if haversine(report["lat"], report["lng"], fence.lat, fence.lng)
+            <= fence.radius
+        }
+        if geofences.inside(report["lat"], report["lng"]) != expected:
+            mismatches += 1
+
+    stats = geofences.stats()
+    print(f"Fences:       {args.fences}")
+    print(
+        f"Indexing:     {indexing * 1000:.1f} ms, {stats['cells']} cells"
+        f" in {stats['levels']} levels"
+    )
+    print(f"Reports:      {args.reports}, {hass.bus.events} events")
+    print(f"Per report:   {per_report * 1e6:.1f} us")
+    print(f"Load:         {per_report * args.rate * 100:.2f} % at {args.rate}/s")
+    print(f"Mismatches:   {mismatches} of 1000 checked against linear scan")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
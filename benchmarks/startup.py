@@ -0,0 +1,110 @@
+"""Startup benchmark for the tetraconnect integration.
+
+Measure the import time of the integration modules HA loads on bootstrap and store
+the result together with the integration version in startup_history.jsonl, one line
+per release replacing an earlier result of the same version. Run it on the release
+commit and commit the updated history with it, thus startup costs are tracked over
+releases. Time to first entity and the other startup
+stages are taken from a diagnostics download of a running instance, if given.
+
+Needs an environment with Home Assistant installed, run from the repository root:
+    python benchmarks/startup.py [--diagnostics config_entry-tetraconnect.json]
+
+"""
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST = ROOT / "custom_components" / "tetraconnect" / "manifest.json"
+HISTORY = Path(__file__).resolve().parent / "startup_history.jsonl"
+PACKAGE = "custom_components.tetraconnect"
+
+# modules HA imports on bootstrap of the integration
+BOOTSTRAP_IMPORTS = [PACKAGE, f"{PACKAGE}.config_flow", f"{PACKAGE}.sensor"]
+
+
+def measure_import_time() -> dict[str, float]:
+    """Import the bootstrap modules in a fresh interpreter and return times in ms."""
+    code = "import " + ", ".join(BOOTSTRAP_IMPORTS)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    own = 0
+    total = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        # nested imports are indented, top level imports follow a single space
+        if module.strip().startswith(PACKAGE):
+            own += int(self_us)
+            if module[1:].rstrip() in BOOTSTRAP_IMPORTS:
+                total += int(cumulative_us)
+
+    return {"own_ms": own / 1000, "cumulative_ms": total / 1000}
+
+
+def write_history(result: dict[str, object]) -> None:
+    """Store a result in the history, replacing the one of the same version."""
+    lines = []
+    if HISTORY.exists():
+        lines = [
+            line
+            for line in HISTORY.read_text(encoding="utf-8").splitlines()
+            if line and json.loads(line)["version"] != result["version"]
+        ]
+    lines.append(json.dumps(result))
+    HISTORY.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    """Run the benchmark and print the result."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of import runs")
+    parser.add_argument(
+        "--diagnostics", type=Path, help="diagnostics download of a running instance"
+    )
+    parser.add_argument(
+        "--no-history", action="store_true", help="do not update the history file"
+    )
+    args = parser.parse_args()
+
+    runs = [measure_import_time() for _ in range(args.runs)]
+    result: dict[str, object] = {
+        "version": json.loads(MANIFEST.read_text(encoding="utf-8"))["version"],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import_own_ms": statistics.median(run["own_ms"] for run in runs),
+        "import_cumulative_ms": statistics.median(
+            run["cumulative_ms"] for run in runs
+        ),
+    }
+
+    if args.diagnostics:
+        diagnostics = json.loads(args.diagnostics.read_text(encoding="utf-8"))
+        timings = diagnostics.get("data", diagnostics).get("startup_timings") or {}
+        result["startup_timings_ms"] = timings
+        result["time_to_first_entity_ms"] = timings.get("first_entity")
+
+    print(json.dumps(result, indent=2))
+
+    if not args.no_history:
+        write_history(result)
+
+
+if __name__ == "__main__":
+    main()
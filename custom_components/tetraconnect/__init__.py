@@ -6,8 +6,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 
-from .const import DOMAIN
+from .const import CTSP_SERVICE_PROFILES, DOMAIN, PREFILTER_OPTIONS
 from .coordinator import TetraconnectCoordinator
+from .services import async_setup_services, async_unload_services
 
 # _LOGGER = logging.getLogger(__name__)
 
@@ -20,14 +21,37 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # await coordinator.async_config_entry_first_refresh()
     await coordinator.async_start()
     hass.data[DOMAIN] = coordinator
+    async_setup_services(hass)
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    coordinator.mark_startup("platforms_set_up")
+
+    # initialize the device after entities are registered, off the setup path
+    config_entry.async_create_background_task(
+        hass,
+        coordinator.async_initialize_device(),
+        f"{DOMAIN} device initialization",
+    )
+    config_entry.async_on_unload(config_entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Apply changed options without reloading, thus without reconnecting."""
+    coordinator: TetraconnectCoordinator = hass.data[DOMAIN]
+    coordinator.set_prefilter(
+        {key: config_entry.options.get(key, "") for key in PREFILTER_OPTIONS}
+    )
+    coordinator.set_poll_fleet(config_entry.options.get("poll_issis", ""))
+    await coordinator.async_set_service_profiles(
+        list(config_entry.options.get("service_profiles", CTSP_SERVICE_PROFILES))
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     coordinator: TetraconnectCoordinator = hass.data[DOMAIN]
+    async_unload_services(hass)
     await coordinator.async_stop()
     await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
 
@@ -0,0 +1,221 @@
+"""Compressed archive of raw PEI traffic in tetraconnect integration.
+
+Received data is archived in segments of gzip files. Data is collected in memory
+and compressed in batches, each batch as separate gzip member. Thus a segment is a
+valid gzip file and each batch can be decompressed on its own. Frames are packed as
+receive time (epoch seconds, double) and length (unsigned int) followed by the data.
+
+Each segment has an index file with one JSON line per batch: offset and length of
+the gzip member, time of the first and last frame and number of frames. Thus a time
+range is located by reading the index only.
+
+"""
+
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+import logging
+from pathlib import Path
+import struct
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_DIRECTORY,
+    ARCHIVE_FLUSH_INTERVAL,
+    ARCHIVE_MAX_SIZE,
+    ARCHIVE_RETENTION,
+    ARCHIVE_SEGMENT_AGE,
+    ARCHIVE_SEGMENT_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct(">dI")
+SEGMENT_SUFFIX = ".raw.gz"
+INDEX_SUFFIX = ".idx"
+
+
+class _Segment:
+    """Segment currently written, only used by the writer thread."""
+
+    def __init__(self, path: Path, started: float) -> None:
+        """Initialize the segment."""
+        self.path = path
+        self.index = path.with_name(path.name[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX)
+        self.started = started
+        self.size = path.stat().st_size if path.exists() else 0
+
+
+class TetraArchive:
+    """Archive writer fed with raw serial data.
+
+    Frames are buffered until ARCHIVE_BATCH_SIZE bytes are collected or
+    ARCHIVE_FLUSH_INTERVAL seconds passed. Batches are compressed and written by a
+    single writer thread, thus the event loop is never blocked and batches stay in
+    order. Segments are rotated by ARCHIVE_SEGMENT_SIZE and ARCHIVE_SEGMENT_AGE,
+    segments older than ARCHIVE_RETENTION seconds are deleted, as are the oldest
+    segments if all exceed ARCHIVE_MAX_SIZE bytes.
+
+    """
+
+    def __init__(self, hass: HomeAssistant, timers) -> None:
+        """Initialize the archive, timers is the coordinators timer wheel."""
+        self.hass = hass
+        self.directory = Path(hass.config.path(ARCHIVE_DIRECTORY))
+        self._timers = timers
+        self._frames: list[bytes] = []
+        self._first = 0.0
+        self._last = 0.0
+        self._buffered = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._segment: _Segment | None = None
+
+        self.frames = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.deleted = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start the writer thread."""
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=ARCHIVE_DIRECTORY)
+
+    async def async_stop(self) -> None:
+        """Write pending frames and stop the writer thread."""
+        if self._executor is None:
+            return
+        self._timers.cancel("archive_flush")
+        self.flush()
+        executor, self._executor = self._executor, None
+        await self.hass.async_add_executor_job(executor.shutdown)
+
+    @callback
+    def append(self, data: bytes, received: float | None = None) -> None:
+        """Buffer data received at the given epoch time, now if not given."""
+        if self._executor is None or not data:
+            return
+        if received is None:
+            received = time.time()
+
+        if not self._frames:
+            self._first = received
+            self._timers.schedule("archive_flush", ARCHIVE_FLUSH_INTERVAL, self.flush)
+        self._frames.append(FRAME_HEADER.pack(received, len(data)) + data)
+        self._last = received
+        self._buffered += len(data)
+        self.frames += 1
+
+        if self._buffered >= ARCHIVE_BATCH_SIZE:
+            self._timers.cancel("archive_flush")
+            self.flush()
+
+    @callback
+    def flush(self) -> None:
+        """Hand the buffered frames to the writer thread."""
+        if not self._frames or self._executor is None:
+            return
+        batch = (b"".join(self._frames), self._first, self._last, len(self._frames))
+        self._frames = []
+        self._buffered = 0
+        self.batches += 1
+
+        future = self.hass.loop.run_in_executor(self._executor, self._write, *batch)
+        future.add_done_callback(self._write_done)
+
+    def _write_done(self, future: asyncio.Future) -> None:
+        """Log failed writes."""
+        if not future.cancelled() and (err := future.exception()) is not None:
+            _LOGGER.error("Failed to write archive: %s", err)
+
+    def _write(self, data: bytes, first: float, last: float, frames: int) -> None:
+        """Compress and append a batch, rotating the segment if due."""
+        segment = self._segment
+        if (
+            segment is None
+            or segment.size >= ARCHIVE_SEGMENT_SIZE
+            or first - segment.started >= ARCHIVE_SEGMENT_AGE
+        ):
+            segment = self._rotate(first)
+
+        member = gzip.compress(data, mtime=int(first))
+        with segment.path.open("ab") as file:
+            file.write(member)
+        entry = {
+            "offset": segment.size,
+            "length": len(member),
+            "first": first,
+            "last": last,
+            "frames": frames,
+        }
+        with segment.index.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        segment.size += len(member)
+        self.bytes_written += len(member)
+
+    def _rotate(self, started: float) -> _Segment:
+        """Start a new segment and enforce retention, run in the writer thread."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = time.strftime("%Y%m%d-%H%M%S", time.gmtime(started))
+        self._segment = _Segment(self.directory / f"{name}{SEGMENT_SUFFIX}", started)
+        _LOGGER.debug("Started archive segment %s", self._segment.path)
+
+        segments = sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        total = sum(path.stat().st_size for path in segments)
+        for path in segments:
+            if path == self._segment.path:
+                break
+            if (
+                path.stat().st_mtime >= started - ARCHIVE_RETENTION
+                and total <= ARCHIVE_MAX_SIZE
+            ):
+                break
+            total -= path.stat().st_size
+            path.unlink()
+            path.with_name(path.name[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX).unlink(
+                missing_ok=True
+            )
+            self.deleted += 1
+            _LOGGER.info("Deleted archive segment %s", path)
+
+        return self._segment
+
+    def stats(self) -> dict[str, int | bool]:
+        """Return archive statistics, e.g. for diagnostics."""
+        return {
+            "enabled": self._executor is not None,
+            "frames": self.frames,
+            "batches": self.batches,
+            "bytes_written": self.bytes_written,
+            "segments_deleted": self.deleted,
+        }
+
+
+def read_archive(
+    directory: Path, start: float = 0.0, end: float = float("inf")
+) -> Iterator[tuple[float, bytes]]:
+    """Yield receive time and data of all archived frames within a time range.
+
+    Only batches overlapping the time range are decompressed.
+
+    """
+    for index in sorted(directory.glob(f"*{INDEX_SUFFIX}")):
+        path = index.with_name(index.name[: -len(INDEX_SUFFIX)] + SEGMENT_SUFFIX)
+        with index.open(encoding="utf-8") as entries, path.open("rb") as segment:
+            for line in entries:
+                entry = json.loads(line)
+                if entry["last"] < start or entry["first"] > end:
+                    continue
+                segment.seek(entry["offset"])
+                data = gzip.decompress(segment.read(entry["length"]))
+                offset = 0
+                while offset < len(data):
+                    received, length = FRAME_HEADER.unpack_from(data, offset)
+                    offset += FRAME_HEADER.size
+                    if start <= received <= end:
+                        yield received, data[offset : offset + length]
+                    offset += length
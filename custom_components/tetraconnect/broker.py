@@ -0,0 +1,213 @@
+"""Fan-out of decoded messages to independent consumers in tetraconnect integration."""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Hashable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import BROKER_BATCH_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+Handler = Callable[[str, Mapping[str, Any]], None]
+# pending message of a consumer: queue time (event loop time), key, message
+_Entry = tuple[float, str, Mapping[str, Any]]
+
+
+class _Consumer:
+    """Bounded queue and counters of one consumer."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        maxsize: int,
+        coalesce: Callable[[Mapping[str, Any]], Hashable] | None,
+        accepts: Callable[[str, Mapping[str, Any]], bool] | None,
+        overflow: Handler | None,
+    ) -> None:
+        """Initialize the consumer."""
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.coalesce = coalesce
+        self.accepts = accepts
+        self.overflow = overflow
+        self.queue: deque[_Entry] = deque()
+        self.latest: dict[Hashable, _Entry] = {}
+        self.handle: asyncio.Handle | None = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.overflowed = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of pending messages."""
+        return len(self.queue) + len(self.latest)
+
+    def put(self, entry: _Entry) -> None:
+        """Queue a message, dropping the oldest one if the queue is full.
+
+        With an overflow handler the message is handed to it instead of dropping any.
+
+        """
+        if self.coalesce is not None:
+            latest = self.latest
+            coalesce_key = self.coalesce(entry[2])
+            if coalesce_key in latest:
+                # last value wins, queue position and time of the first are kept
+                latest[coalesce_key] = (latest[coalesce_key][0], *entry[1:])
+                self.coalesced += 1
+                return
+            if len(latest) >= self.maxsize:
+                del latest[next(iter(latest))]
+                self.dropped += 1
+            latest[coalesce_key] = entry
+        else:
+            if len(self.queue) >= self.maxsize:
+                if self.overflow is not None:
+                    self.overflowed += 1
+                    try:
+                        self.overflow(*entry[1:])
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error in overflow of consumer %s", self.name)
+                    return
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(entry)
+
+        depth = self.depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def pop(self) -> _Entry | None:
+        """Return the oldest pending message, None if there is none."""
+        if self.queue:
+            return self.queue.popleft()
+        if self.latest:
+            return self.latest.pop(next(iter(self.latest)))
+        return None
+
+    def clear(self) -> None:
+        """Drop all pending messages."""
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        self.queue.clear()
+        self.latest.clear()
+
+
+class TetraBroker:
+    """Publishes each decoded message once to all subscribed consumers.
+
+    Queued consumers get their own bounded queue of maxsize messages and are drained
+    independently in the next event loop iterations, at most BROKER_BATCH_SIZE
+    messages at once. If a queue is full, its oldest message is dropped. With a
+    coalesce function pending messages of equal coalesce keys are replaced, only the
+    latest one is kept. Thus a slow consumer never backs up decoding or any other
+    consumer, it only loses messages of its own. Consumers which must not lose any
+    message, like counters, pass an overflow handler instead: messages not fitting
+    into the full queue are handed to it right away, it only does the cheap part of
+    the work, e.g. counting without any further processing.
+
+    Inline consumers (maxsize 0) are called directly in order of subscription, for
+    stages which must see every message before others do, like enrichment of the
+    record or queues of their own. An error in one consumer is logged, all others
+    still get the message.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the broker."""
+        self.hass = hass
+        self._inline: list[_Consumer] = []
+        self._queued: list[_Consumer] = []
+
+    @callback
+    def subscribe(
+        self,
+        name: str,
+        handler: Handler,
+        maxsize: int = 0,
+        coalesce: Callable[[Mapping[str, Any]], Hashable] | None = None,
+        accepts: Callable[[str, Mapping[str, Any]], bool] | None = None,
+        overflow: Handler | None = None,
+    ) -> None:
+        """Add a consumer, accepts selects the messages it is interested in."""
+        consumer = _Consumer(name, handler, maxsize, coalesce, accepts, overflow)
+        (self._queued if maxsize else self._inline).append(consumer)
+
+    @callback
+    def put(self, key: str, message: Mapping[str, Any]) -> None:
+        """Publish a message with its entity key to all consumers."""
+        for consumer in self._inline:
+            if consumer.accepts is None or consumer.accepts(key, message):
+                consumer.delivered += 1
+                try:
+                    consumer.handler(key, message)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in consumer %s", consumer.name)
+
+        entry = (self.hass.loop.time(), key, message)
+        for consumer in self._queued:
+            if consumer.accepts is None or consumer.accepts(key, message):
+                consumer.put(entry)
+                if consumer.handle is None:
+                    consumer.handle = self.hass.loop.call_soon(self._drain, consumer)
+
+    @callback
+    def _drain(self, consumer: _Consumer) -> None:
+        """Hand pending messages to a consumer, yield to the event loop after a batch."""
+        consumer.handle = None
+        now = self.hass.loop.time()
+
+        for _ in range(BROKER_BATCH_SIZE):
+            entry = consumer.pop()
+            if entry is None:
+                break
+            queued, key, message = entry
+            consumer.lag = lag = now - queued
+            if lag > consumer.max_lag:
+                consumer.max_lag = lag
+            consumer.delivered += 1
+            try:
+                consumer.handler(key, message)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in consumer %s", consumer.name)
+
+        if consumer.depth:
+            consumer.handle = self.hass.loop.call_soon(self._drain, consumer)
+
+    @callback
+    def stop(self) -> None:
+        """Cancel draining and drop all pending messages."""
+        for consumer in self._queued:
+            consumer.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return queue depths, lag and counters per consumer, e.g. for diagnostics."""
+        stats: dict[str, dict[str, Any]] = {}
+        for consumer in self._inline:
+            stats[consumer.name] = {"inline": True, "delivered": consumer.delivered}
+        for consumer in self._queued:
+            stats[consumer.name] = {
+                "inline": False,
+                "depth": consumer.depth,
+                "max_depth": consumer.max_depth,
+                "maxsize": consumer.maxsize,
+                "delivered": consumer.delivered,
+                "dropped": consumer.dropped,
+                "overflowed": consumer.overflowed,
+                "coalesced": consumer.coalesced,
+                "lag_ms": round(consumer.lag * 1000, 1),
+                "max_lag_ms": round(consumer.max_lag * 1000, 1),
+            }
+        return stats
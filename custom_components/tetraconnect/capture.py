@@ -0,0 +1,303 @@
+"""Offline decoder for captured PEI traffic of tetraconnect integration.
+
+Stream capture files through the same tokenizer and SDS decoders as the integration
+and write the decoded SDS as CSV, JSONL or Parquet (needs pyarrow). Plain files are
+memory-mapped, gzip files are decompressed as a stream, thus memory stays constant
+for any file size.
+
+Captures may either be raw serial data or HA logs with debug logging enabled for
+tetraconnect, which add the time each chunk of data was received.
+
+Decoders, data handlers and this module do not depend on HA. As the package of the
+integration does, run it without HA by scripts/decode_capture.py, which loads the
+modules directly:
+    python scripts/decode_capture.py home-assistant.log.gz -o sds.csv
+
+Within an HA environment it also runs as module:
+    python -m custom_components.tetraconnect.capture home-assistant.log.gz -o sds.csv
+
+"""
+
+import argparse
+import ast
+from collections.abc import Iterator
+import contextlib
+import csv
+from datetime import datetime
+import gzip
+import io
+import json
+import logging
+import mmap
+from pathlib import Path
+import sys
+from typing import Any
+
+from .decoders import DecoderSink, get_decoder_class
+from .record import TetraRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+COLUMNS = ("issi", "time", "sds_type", "lat", "lng", "velocity", "status", "reason")
+CHUNK_SIZE = 1 << 20  # Bytes read at once from raw captures
+PARQUET_BATCH_SIZE = 65536  # Rows per Parquet row group
+LOG_MARKER = b"Raw data received: "
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+Row = tuple[Any, ...]
+
+
+class _CsvWriter:
+    """Write rows as CSV."""
+
+    def __init__(self, output: io.TextIOBase) -> None:
+        """Initialize the writer and write the header."""
+        self._writer = csv.writer(output)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, row: Row) -> None:
+        """Write one row."""
+        self._writer.writerow(row)
+
+    def close(self) -> None:
+        """Nothing to flush."""
+
+
+class _JsonlWriter:
+    """Write rows as JSON lines."""
+
+    def __init__(self, output: io.TextIOBase) -> None:
+        """Initialize the writer."""
+        self._output = output
+
+    def write(self, row: Row) -> None:
+        """Write one row."""
+        self._output.write(json.dumps(dict(zip(COLUMNS, row))) + "\n")
+
+    def close(self) -> None:
+        """Nothing to flush."""
+
+
+class _ParquetWriter:
+    """Write rows as Parquet, one row group per PARQUET_BATCH_SIZE rows."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the writer, pyarrow is imported on demand only."""
+        try:
+            import pyarrow as pa  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise SystemExit("Parquet output needs pyarrow, please install it") from err
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("issi", pa.string()),
+                ("time", pa.string()),
+                ("sds_type", pa.int32()),
+                ("lat", pa.float64()),
+                ("lng", pa.float64()),
+                ("velocity", pa.int32()),
+                ("status", pa.int32()),
+                ("reason", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._columns: list[list[Any]] = [[] for _ in COLUMNS]
+
+    def write(self, row: Row) -> None:
+        """Buffer one row, write a row group if the batch is full."""
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._columns[0]) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as row group."""
+        # velocity may be "unknown", which is no integer
+        velocity = COLUMNS.index("velocity")
+        self._columns[velocity] = [
+            value if isinstance(value, int) else None
+            for value in self._columns[velocity]
+        ]
+        self._writer.write_table(
+            self._pa.Table.from_arrays(
+                [self._pa.array(column) for column in self._columns],
+                schema=self._schema,
+            )
+        )
+        self._columns = [[] for _ in COLUMNS]
+
+    def close(self) -> None:
+        """Write remaining rows and close the file."""
+        if self._columns[0]:
+            self._flush()
+        self._writer.close()
+
+
+class _CaptureSink(DecoderSink):
+    """Turn decoded SDS records into rows."""
+
+    def __init__(self, manufacturer: str, writer) -> None:
+        """Initialize the sink."""
+        super().__init__(manufacturer)
+        self.writer = writer
+        self.rows = 0
+
+    def put(self, key: str, message: TetraRecord) -> None:
+        """Write a row for each valid SDS record."""
+        if key != "+CTSDSR" or message["validity"] != "valid":
+            return
+
+        sds_type = message["sds_type"]
+        location = sds_type == 10
+        self.writer.write(
+            (
+                message["issi_sen"],
+                datetime.fromtimestamp(message.received).isoformat()
+                if message.received
+                else None,
+                sds_type,
+                message["lat"] if location else None,
+                message["lng"] if location else None,
+                message["velocity"] if location else None,
+                message["tetra_status"] if sds_type == 128 else None,
+                message["reason_sending_desc"] if location else None,
+            )
+        )
+        self.rows += 1
+
+
+@contextlib.contextmanager
+def _open_capture(path: Path) -> Iterator[Any]:
+    """Open a capture file as binary stream, memory-mapped or gzip decompressing."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as stream:
+            yield stream
+        return
+
+    with path.open("rb") as file:
+        if path.stat().st_size == 0:
+            yield io.BytesIO()
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as stream:
+            yield stream
+
+
+def _peek(stream) -> bytes:
+    """Return the start of a stream without consuming it."""
+    if isinstance(stream, mmap.mmap):
+        return stream[:CHUNK_SIZE]
+    if hasattr(stream, "peek"):
+        return stream.peek(CHUNK_SIZE)
+    return b""
+
+
+def _iter_raw(stream) -> Iterator[tuple[bytes, float]]:
+    """Yield chunks of raw serial data, cut after complete lines."""
+    rest = b""
+    while chunk := stream.read(CHUNK_SIZE):
+        data = rest + chunk
+        cut = data.rfind(b"\r\n") + 2
+        if cut < 2:
+            rest = data
+            continue
+        rest = data[cut:]
+        yield data[:cut], 0.0
+    if rest:
+        yield rest, 0.0
+
+
+def _iter_log(stream) -> Iterator[tuple[bytes, float]]:
+    """Yield chunks of serial data with their receive time from HA debug logs."""
+    for line in iter(stream.readline, b""):
+        index = line.find(LOG_MARKER)
+        if index < 0:
+            continue
+        try:
+            data = ast.literal_eval(line[index + len(LOG_MARKER) :].strip().decode())
+            received = datetime.strptime(
+                line[:23].decode(), LOG_TIME_FORMAT
+            ).timestamp()
+        except (ValueError, SyntaxError, UnicodeDecodeError):
+            _LOGGER.debug("Skipping unreadable log line: %s", line)
+            continue
+        if isinstance(data, bytes):
+            yield data, received
+
+
+def decode_capture(path: Path, manufacturer: str, capture_format: str, writer) -> int:
+    """Decode one capture file and write its SDS rows, return the number of rows."""
+    sink = _CaptureSink(manufacturer, writer)
+    decoder = get_decoder_class(manufacturer)(sink)
+
+    with _open_capture(path) as stream:
+        if capture_format == "auto":
+            capture_format = "log" if LOG_MARKER in _peek(stream) else "raw"
+        chunks = _iter_log(stream) if capture_format == "log" else _iter_raw(stream)
+
+        remaining = b""
+        for data, received in chunks:
+            try:
+                remaining = decoder.data_handler(remaining + data, received)
+            except (ValueError, TypeError) as err:
+                _LOGGER.error("Error processing data: %s", err)
+                remaining = b""
+
+    return sink.rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the offline decoder."""
+    parser = argparse.ArgumentParser(
+        description="Decode captured PEI traffic into CSV, JSONL or Parquet."
+    )
+    parser.add_argument("captures", nargs="+", type=Path, help="capture files")
+    parser.add_argument(
+        "-o", "--output", required=True, help="output file, - for stdout"
+    )
+    parser.add_argument(
+        "-f", "--format", choices=("csv", "jsonl", "parquet"), help="output format"
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        choices=("auto", "raw", "log"),
+        default="auto",
+        help="capture format: raw serial data or HA debug log",
+    )
+    parser.add_argument("-m", "--manufacturer", default="Motorola")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+
+    output_format = args.format or Path(args.output).suffix.lstrip(".") or "csv"
+    if output_format not in ("csv", "jsonl", "parquet"):
+        parser.error(f"Unknown output format: {output_format}")
+    if output_format == "parquet" and args.output == "-":
+        parser.error("Parquet output needs an output file")
+
+    with contextlib.ExitStack() as stack:
+        if output_format == "parquet":
+            writer = _ParquetWriter(args.output)
+        else:
+            output = (
+                sys.stdout
+                if args.output == "-"
+                else stack.enter_context(
+                    open(args.output, "w", encoding="utf-8", newline="")
+                )
+            )
+            writer = (
+                _CsvWriter(output) if output_format == "csv" else _JsonlWriter(output)
+            )
+        stack.callback(writer.close)
+
+        for path in args.captures:
+            rows = decode_capture(path, args.manufacturer, args.input, writer)
+            print(f"{path}: {rows} SDS decoded", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,20 @@
 import asyncio
 import contextlib
 import logging
+import time
 
-import serial
-import serial_asyncio
+from homeassistant.helpers.importlib import async_import_module
 
 from .const import (
+    AT_RESPONSE_TIMEOUT,
     MAX_RETRY_ATTEMPTS,
+    REASSEMBLY_TIMEOUT,
     SLEEP_TIME_CONNECTION_CHECK,
     SLEEP_TIME_RETRY,
     TETRA_DEFAULTS,
 )
+from .decoders import async_get_decoder_class
 from .helpers import TetraconnectHelpers
-from .motorola import Motorola
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,6 +33,8 @@ class COMManager:
         self.protocol = None
         self._tetra_defaults = TETRA_DEFAULTS.copy()
         self._connection_check_task = None
+        self._decoder_cls: type | None = None
+        self.decoder = None
 
         self.helpers = TetraconnectHelpers(coordinator)
 
@@ -59,12 +63,25 @@ class COMManager:
 
         """
         loop = asyncio.get_running_loop()
+        # serial libraries are imported on first connect, not on HA startup
+        serial_asyncio = await async_import_module(
+            self.coordinator.hass, "serial_asyncio"
+        )
+
+        # resolve the manufacturer specific data handler once per connection
+        if self._decoder_cls is None:
+            self._decoder_cls = await async_get_decoder_class(
+                self.coordinator.hass, self.coordinator.manufacturer
+            )
+        decoder = self.decoder = self._decoder_cls(self.coordinator)
+        decoder.prefilter.configure(self.coordinator.prefilter_options)
+
         (
             self.transport,
             self.protocol,
         ) = await serial_asyncio.create_serial_connection(
             loop,
-            lambda: SerialHandler(self.coordinator),
+            lambda: SerialHandler(self.coordinator, decoder.data_handler),
             self.com_port,
             baudrate=self.baudrate,
         )
@@ -72,6 +89,26 @@ class COMManager:
         _LOGGER.info("Serial connection established on %s", self.com_port)
         # await self._tetra_initialize()
 
+    def write(self, data: bytes) -> bool:
+        """Write data to the radio, return False if not connected."""
+        if self.transport is None or self.transport.is_closing():
+            return False
+        self.transport.write(data)
+        return True
+
+    def set_prefilter(self, options: dict[str, str]) -> None:
+        """Apply changed pre-filter options to the running data handler."""
+        if self.decoder is not None:
+            self.decoder.prefilter.configure(options)
+
+    def prefilter_stats(self) -> dict[str, int | bool] | None:
+        """Return the pre-filter counters, None if not connected yet."""
+        return self.decoder.prefilter.stats() if self.decoder is not None else None
+
+    def cache_stats(self) -> dict[str, float] | None:
+        """Return the payload cache statistics, None if not connected yet."""
+        return self.decoder.cache_stats() if self.decoder is not None else None
+
     async def _periodic_connection_check(self):
         """Continuously ensure serial connection.
 
@@ -98,7 +135,7 @@ class COMManager:
                 await self._connect()
                 if self.transport and not self.transport.is_closing():
                     break
-            except (serial.SerialException, OSError, ValueError) as e:
+            except (OSError, ValueError) as e:  # incl. SerialException
                 _LOGGER.warning("Connection attempt %d failed: %s", attempt, e)
             attempt += 1
             await asyncio.sleep(SLEEP_TIME_RETRY)
@@ -110,7 +147,7 @@ class COMManager:
                 await self._connect()
                 if self.transport and not self.transport.is_closing():
                     return
-            except (serial.SerialException, OSError, ValueError) as e:
+            except (OSError, ValueError) as e:  # incl. SerialException
                 _LOGGER.warning("Connection attempt %d failed: %s", attempt, e)
             await asyncio.sleep(SLEEP_TIME_RETRY)
         self.helpers.update_connection_status(3)
@@ -130,74 +167,51 @@ class COMManager:
         Device information like model, sw-version, revision, manufacturer were
         already requested in the config flow, so we do not request them again here.
 
+        The service profiles are taken from the coordinator, thus calling this again
+        applies changed profiles without reconnecting.
+
+        Commands are sent by TetraCommands, their results are read by the decoder,
+        thus messages received meanwhile are decoded as usual.
+
         """
         # these commands are standard TETRA commands, which every device should respond to
 
         _LOGGER.info("##### Initializing TETRA services on %s #####", self.com_port)
 
-        if not self.transport:
-            for _ in range(5):
-                await asyncio.sleep(0.2)
-                if self.transport:
-                    break
-            else:
-                _LOGGER.warning(
-                    "No serial connection available, initializing TETRA device failed"
-                )
-                return
-
-        raw_data = {}
-
-        # +CTSP=<service profile>, <service layer1>, [<service layer2>], [<AI mode>], [<link identifier>]
-        service_commands = [
-            # "AT+CTSP=1,2,20\r\n",  # Status TE
-            "AT+CTSP=2,2,20\r\n",  # Status MT & TE
-            "AT+CTSP=1,3,130\r\n",  # Textnachrichten einschalten
-            "AT+CTSP=1,3,131\r\n",  # GPS einschalten
-            "AT+CTSP=1,3,10\r\n",  # Status GPS
-            "AT+CTSP=1,3,137\r\n",  # Immediate Text
-            "AT+CTSP=1,3,138\r\n",  # Alarm
-            # "AT+CTSP=2,0\r\n",
-            # "AT+CTSP=2,1\r\n",
-            # "AT+CTSP=2,2\r\n",
-            # "AT+CTSP=2,3\r\n",
-            # "AT+CTSP=2,4\r\n",
-        ]
-
-        for cmd in service_commands:
-            _LOGGER.debug("Sending service profile command: %s", cmd.strip())
-            if self.protocol is not None:
-                self.protocol.expect_response = True
-                self.protocol.response_future = (
-                    asyncio.get_running_loop().create_future()
-                )
-                self.transport.write(cmd.encode())
-                await asyncio.sleep(0.1)
-                _LOGGER.debug("Waiting for response to command: %s", cmd.strip())
-                try:
-                    response = await asyncio.wait_for(
-                        self.protocol.response_future, timeout=5
-                    )
-                    self.protocol.expect_response = False
-                    raw_data[cmd] = response
-                except asyncio.TimeoutError:
-                    _LOGGER.error(
-                        "Timeout while waiting for response to command: %s", cmd.strip()
-                    )
-                    raw_data[cmd] = b"CME ERROR: response timeout"
-            else:
-                _LOGGER.warning(
-                    "Service profile not initialized, cannot send command: %s",
-                    cmd.strip(),
-                )
+        if not await self._async_wait_connected():
+            _LOGGER.warning(
+                "No serial connection available, initializing TETRA device failed"
+            )
+            return
 
-        # check responses
-        for cmd, resp in raw_data.items():
-            if resp != b"\r\nOK\r\n":
+        results: dict[str, str | None] = {}
+        commands = self.helpers.service_profile_commands(
+            self.coordinator.service_profiles
+        )
+        for cmd in commands:
+            _LOGGER.debug("Sending service profile command: %s", cmd.strip())
+            results[cmd] = await self.coordinator.commands.async_command(
+                cmd, AT_RESPONSE_TIMEOUT
+            )
+
+        self._check_service_responses(results)
+
+    async def _async_wait_connected(self) -> bool:
+        """Wait up to a second for the serial connection, return if it is there."""
+        for _ in range(5):
+            if self.transport is not None and not self.transport.is_closing():
+                return True
+            await asyncio.sleep(0.2)
+        return False
+
+    def _check_service_responses(self, results: dict[str, str | None]) -> None:
+        """Check results of service profile commands and log failed commands."""
+        for cmd, result in results.items():
+            if result != "OK":
                 _LOGGER.warning(
                     "Service profile command '%s' failed with response: %s",
-                    cmd.strip().replace("\r\n", ""),
-                    resp.decode("utf-8").strip().replace("\r\n", ""),
+                    cmd.strip(),
+                    result or "no response",
                 )
 
         _LOGGER.info(
@@ -208,15 +222,18 @@ class COMManager:
 class SerialHandler(asyncio.Protocol):
     """Handles serial connection incl incoming data."""
 
-    def __init__(self, coordinator) -> None:
-        """Initialize the data handler."""
+    def __init__(self, coordinator, data_handler) -> None:
+        """Initialize the data handler.
+
+        The data_handler of the configured manufacturer is passed in, thus no
+        manufacturer has to be checked on incoming data.
+
+        """
         self.coordinator = coordinator
         self.raw_data = b""
 
-        self.motorola = Motorola(coordinator)
+        self.data_handler = data_handler
         self.helpers = TetraconnectHelpers(coordinator)
-        self.expect_response = False
-        self.response_future = None
 
     def connection_made(self, transport):
         """Handle the connection being made."""
@@ -225,42 +242,42 @@ class SerialHandler(asyncio.Protocol):
 
     def data_received(self, data):
         """Handle incoming data."""
+        received = time.monotonic()
+        if self.coordinator.archive is not None:
+            self.coordinator.archive.append(data)
         self.raw_data += data
         _LOGGER.debug("Raw data received: %s", data)
 
-        remaining = b""
-
-        # check if expected response is set
-        if self.expect_response:
-            # Set result only if not already done
-            if self.response_future is not None and not self.response_future.done():
-                self.response_future.set_result(data)
-        else:
-            try:
-                if self.coordinator.manufacturer == "Motorola":
-                    remaining = self.motorola.data_handler(self.raw_data)
-
-                #################################################
-                ### Add other manufacturers data handler here ###
-                #################################################
-
-                else:
-                    _LOGGER.error(
-                        "Unsupported manufacturer: %s", self.coordinator.manufacturer
-                    )
-                    return
+        try:
+            # manufacturer specific data handler, see decoders.py
+            remaining = self.data_handler(self.raw_data, received)
+
+            # put remaining data back into raw_data
+            self.raw_data = remaining
+            if remaining:
+                self.coordinator.timers.schedule(
+                    ("reassembly", id(self)),
+                    REASSEMBLY_TIMEOUT,
+                    self._discard_incomplete,
+                )
+            else:
+                self.coordinator.timers.cancel(("reassembly", id(self)))
+            _LOGGER.debug("Remaining data after processing: %s", remaining)
 
-                # put remaining data back into raw_data
-                self.raw_data = remaining
-                _LOGGER.debug("Remaining data after processing: %s", remaining)
+            # TODO
+            # add MQTT publish here and check if mqtt publishing or entity creation is needed
 
-                # TODO
-                # add MQTT publish here and check if mqtt publishing or entity creation is needed
+        except (ValueError, TypeError, OSError) as e:  # incl. SerialException
+            _LOGGER.error("Error processing incoming data: %s", e)
 
-            except (ValueError, TypeError, serial.SerialException) as e:
-                _LOGGER.error("Error processing incoming data: %s", e)
+    def _discard_incomplete(self):
+        """Discard incomplete data, if not completed within REASSEMBLY_TIMEOUT."""
+        _LOGGER.warning("Discarding incomplete data: %s", self.raw_data)
+        self.raw_data = b""
 
     def connection_lost(self, exc):
-        """Handle the connection being lost."""
+        """Handle the connection being lost, incomplete data is discarded."""
         _LOGGER.warning("Serial connection lost: %s", exc)
+        self.coordinator.timers.cancel(("reassembly", id(self)))
+        self.raw_data = b""
         self.helpers.update_connection_status(3)
@@ -0,0 +1,74 @@
+"""AT commands sent to the radio in tetraconnect integration."""
+
+import asyncio
+from collections.abc import Callable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _short(command: str) -> str:
+    """Return the command without its data and line end, for logging."""
+    return command.split("\r", 1)[0]
+
+
+class TetraCommands:
+    """Sends AT commands to the radio one at a time and awaits their result.
+
+    The result of a command is the first final result code (OK, ERROR or
+    +CME ERROR) read after it was written. Result codes are read by the decoder
+    like any other message and handed in by the broker, thus receiving goes on
+    while a command awaits its result. Result codes while no command is in flight
+    are ignored.
+
+    """
+
+    def __init__(self, write: Callable[[bytes], bool]) -> None:
+        """Initialize the commands, write sends data to the radio."""
+        self._write = write
+        self._lock = asyncio.Lock()
+        self._result: asyncio.Future | None = None
+
+        self.sent = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    async def async_command(self, command: str, timeout: float) -> str | None:
+        """Send a command and return its final result code.
+
+        None is returned if the radio is not connected or did not answer within
+        timeout seconds.
+
+        """
+        async with self._lock:
+            self._result = asyncio.get_running_loop().create_future()
+            try:
+                if not self._write(command.encode("latin-1")):
+                    _LOGGER.warning("No connection to send %s", _short(command))
+                    return None
+                self.sent += 1
+                result = await asyncio.wait_for(self._result, timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                _LOGGER.warning("No response to %s", _short(command))
+                return None
+            finally:
+                self._result = None
+
+        if result != "OK":
+            self.failed += 1
+            _LOGGER.debug("Command %s failed with %s", _short(command), result)
+        return result
+
+    @callback
+    def handle_result(self, key: str, message: Mapping[str, Any]) -> None:
+        """Complete the command in flight with a final result code of the radio."""
+        if self._result is not None and not self._result.done():
+            self._result.set_result(key)
+
+    def stats(self) -> dict[str, int]:
+        """Return command counters, e.g. for diagnostics."""
+        return {"sent": self.sent, "failed": self.failed, "timeouts": self.timeouts}
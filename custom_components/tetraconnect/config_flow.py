@@ -6,24 +6,30 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
-import serial
-import serial_asyncio  # type: ignore
 import voluptuous as vol
 
 from homeassistant.config_entries import (
+    ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
+    OptionsFlow,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.importlib import async_import_module
 
 from .const import (
+    CTSP_SERVICE_PROFILES,
     DOMAIN,
+    PREFILTER_OPTIONS,
     MANUFACTURERS_LIST,
     VERSION,
     MINOR_VERSION,
     PATCH_VERSION,
     MQTT_TOPIC_DEFAULT,
 )
+from .prefilter import TetraPreFilter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +44,8 @@ class TetraconnectConfigEntry:
     device_id: str = "unknown"
     model: str = "unknown"
     revision: str = "unknown"
+    worker: bool = False
+    archive: bool = False
 
 
 class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -52,6 +60,12 @@ class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
         self.config_entry = TetraconnectConfigEntry()
         self.errors: dict[str, str] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return TetraconnectOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, object] | None = None
     ) -> ConfigFlowResult:
@@ -61,10 +75,15 @@ class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
             # init error buffer
             self.errors = {}
 
+            # serial libraries are imported on demand to keep them off HA startup
+            serial = await async_import_module(self.hass, "serial")
+
             # set user input variables
             self.config_entry.manufacturer = str(user_input["manufacturer"])
             self.config_entry.serial_port = str(user_input["serial_port"])
             self.config_entry.baudrate = int(str(user_input["baudrate"]))
+            self.config_entry.worker = bool(user_input.get("worker", False))
+            self.config_entry.archive = bool(user_input.get("archive", False))
 
             try:
                 await self._request_device_data(self.config_entry)
@@ -113,6 +132,8 @@ class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
             vol.Required("baudrate", default=38400): vol.All(
                 vol.Coerce(int), vol.Range(min=300, max=115200)
             ),
+            vol.Optional("worker", default=False): bool,
+            vol.Optional("archive", default=False): bool,
             vol.Optional("mqtt", default=True): bool,
         }
         if mqtt_enabled:
@@ -161,6 +182,9 @@ class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
         Service commands will be initialized in com_manager.
 
         """
+        serial = await async_import_module(self.hass, "serial")
+        serial_asyncio = await async_import_module(self.hass, "serial_asyncio")
+
         device_commands = [
             "ATZ\r\n",
             "AT+GMI?\r\n",
@@ -245,3 +269,42 @@ class TetraconnectConfigFlow(ConfigFlow, domain=DOMAIN):
             raise ValueError(
                 f"Manufacturer mismatch: {device_manufacturer} != {user_manufacturer}"
             )
+
+
+class TetraconnectOptionsFlow(OptionsFlow):
+    """Handle options of tetraconnect, applied without reconnecting."""
+
+    async def async_step_init(
+        self, user_input: dict[str, object] | None = None
+    ) -> ConfigFlowResult:
+        """Select the services the radio forwards and the SDS pre-filter."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                TetraPreFilter(user_input)
+            except ValueError:
+                errors["base"] = "invalid_sds_type"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        profiles = options.get("service_profiles", list(CTSP_SERVICE_PROFILES))
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional("service_profiles", default=profiles): cv.multi_select(
+                        {key: key for key in CTSP_SERVICE_PROFILES}
+                    ),
+                    **{
+                        vol.Optional(key, default=options.get(key, "")): str
+                        for key in PREFILTER_OPTIONS
+                    },
+                    vol.Optional(
+                        "poll_issis", default=options.get("poll_issis", "")
+                    ): str,
+                }
+            ),
+            errors=errors,
+        )
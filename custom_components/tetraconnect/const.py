@@ -17,6 +17,101 @@ TETRA_DEFAULTS: dict[str, object] = {
     "tetra_content": "",
 }
 MQTT_TOPIC_DEFAULT = "tetraconnect"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = 300  # Maximum time in seconds between snapshot writes
+SNAPSHOT_MAX_ISSIS = 10000  # Maximum number of ISSIs kept in the snapshot
+SNAPSHOT_MAX_AGE = 86400  # Time in seconds ISSIs without any SDS are kept
+WORKER_START_TIMEOUT = 10  # Time in seconds to wait for the worker process to connect
+WORKER_READ_TIMEOUT = 0.1  # Serial read timeout in seconds, also the pipe poll interval
+WORKER_STATS_INTERVAL = 10  # Time in seconds between decoder statistics of the worker
+
+# +CTSP=<service profile>, <service layer1>, [<service layer2>], [<AI mode>], [<link identifier>]
+# service profiles selectable in the options: service profile if selected, service layers
+CTSP_SERVICE_PROFILES: dict[str, tuple[int, str]] = {
+    # "status": (1, "2,20"),  # Status TE
+    "status": (2, "2,20"),  # Status MT & TE
+    "text": (1, "3,130"),  # Textnachrichten einschalten
+    "gps": (1, "3,131"),  # GPS einschalten
+    "location": (1, "3,10"),  # Status GPS
+    "immediate_text": (1, "3,137"),  # Immediate Text
+    "alarm": (1, "3,138"),  # Alarm
+}
+CTSP_PROFILE_UNSUBSCRIBED = 0  # Service profile of not selected services, MT only
+PREFILTER_OPTIONS = (  # Options of the SDS pre-filter, lists of ISSIs and SDS types
+    "issi_allow",
+    "issi_deny",
+    "sds_type_allow",
+    "sds_type_deny",
+)
+SDS_CACHE_SIZE = 1024  # Number of decoded SDS payloads kept for identical resends
+LATENCY_SAMPLES = 1024  # Number of recent latency samples per stage
+LATENCY_STAGES = ("framing", "decoding", "dispatch", "state_write", "end_to_end")
+AI_SERVICE_SDS_TYPE_4 = 12  # Air interface service of SDS with protocol identifier
+AI_SERVICE_STATUS = 13  # Air interface service of status messages
+SDS_PROTOCOL_TEXT = 0x82  # Protocol identifier of SDS-TL text messages
+TX_QUEUE_SIZE = 100  # Maximum number of SDS pending for transmission
+TX_MIN_INTERVAL = 1.0  # Minimum time in seconds between two SDS sent
+TX_RESPONSE_TIMEOUT = 10  # Time in seconds to wait for the radio to confirm an SDS
+TX_RETRY_DELAY = 5  # Time in seconds to wait before sending a failed SDS again
+TX_MAX_RETRIES = 3  # Maximum number of retries of a failed SDS
+TX_MAX_TEXT_LENGTH = 200  # Maximum number of characters of a text message
+AT_FINAL_RESULTS = ("OK", "ERROR", "+CME ERROR")  # Final result codes of AT commands
+AT_RESPONSE_TIMEOUT = 5  # Time in seconds to wait for the result of an AT command
+LIP_IMMEDIATE_LOCATION_REQUEST = "4400"  # Immediate location report request PDU
+REASON_SENDING_IMMEDIATE_REQUEST = 32  # Reason for sending of a report on request
+POLL_TICK = 2  # Time in seconds between two location requests of the fleet
+POLL_DISTANCE = 500  # Distance in meters after which a moving ISSI is polled again
+POLL_MIN_INTERVAL = 30  # Minimum time in seconds between two reports of an ISSI
+POLL_MAX_INTERVAL = 900  # Polling interval in seconds of ISSIs standing still
+POLL_MAX_OUTSTANDING = 5  # Maximum number of location requests awaiting their report
+POLL_RESPONSE_TIMEOUT = 60  # Time in seconds to wait for the report of a request
+BROKER_QUEUE_SIZE = 1000  # Maximum number of pending messages per queued consumer
+BROKER_BATCH_SIZE = 50  # Maximum number of messages per consumer and event loop iteration
+DISPATCH_BATCH_SIZE = 50  # Maximum number of messages published per event loop iteration
+DISPATCH_OVERLOAD_THRESHOLD = 200  # Pending messages to switch into overload mode
+MIN_STATE_WRITE_INTERVAL = 1.0  # Minimum time in seconds between state writes of an entity
+GEOFENCE_FILE = "tetraconnect_geofences.json"  # Geofences in the HA config directory
+GEOFENCE_CELL_SIZE = 0.01  # Size in degrees of the grid cells indexing geofences
+GEOFENCE_MAX_CELLS = 64  # Larger geofences are indexed in a coarser grid level
+GEOFENCE_LEVEL_FACTOR = 8  # Ratio of the cell sizes of two successive grid levels
+GEOFENCE_LEVELS = 6  # Number of grid levels, the coarsest takes all remaining fences
+# ISSI directory in the HA config directory, the first existing file is loaded
+DIRECTORY_FILES = ("tetraconnect_directory.csv", "tetraconnect_directory.yaml")
+DIRECTORY_FIELDS = ("callsign", "unit", "vehicle_type")  # Fields per ISSI
+TIMER_WHEEL_TICK = 1.0  # Resolution in seconds of the timer wheel
+TIMER_WHEEL_SLOTS = 1024  # Number of slots of the timer wheel
+STALE_TIMEOUT = 900  # Time in seconds without SDS after which an ISSI is stale
+REASSEMBLY_TIMEOUT = 10  # Time in seconds to keep incomplete messages
+LONGTERM_BUCKET = 300  # Time in seconds of buckets counting messages for statistics
+LONGTERM_EMIT_SECOND = 10  # Second after each full hour to emit long-term statistics
+ARCHIVE_DIRECTORY = "tetraconnect_archive"  # Directory in the HA config directory
+ARCHIVE_BATCH_SIZE = 65536  # Bytes collected before compressing a batch
+ARCHIVE_FLUSH_INTERVAL = 10  # Maximum time in seconds data is kept in memory
+ARCHIVE_SEGMENT_SIZE = 64 * 1024 * 1024  # Compressed bytes per archive segment
+ARCHIVE_SEGMENT_AGE = 86400  # Maximum time in seconds covered by an archive segment
+ARCHIVE_RETENTION = 90 * 86400  # Time in seconds archive segments are kept
+ARCHIVE_MAX_SIZE = 10 * 1024 * 1024 * 1024  # Maximum bytes of all archive segments
+TRACK_MAX_POINTS = 500  # Maximum number of points kept per ISSI track
+TRACK_MAX_AGE = 86400  # Time in seconds points are kept in a track
+TRACK_MIN_DISTANCE = 25  # Distance in meters below which fixes are not kept
+TRACK_MIN_ANGLE = 15  # Change of heading in degrees below which fixes are merged
+TRACK_MIN_GAP = 1.0  # Time in seconds between fixes below which a fix is ignored
+TRACK_MAX_SPEED = 300  # Speed in km/h above which a computed speed is implausible
+
+# SDS types and codes with special handling
+SDS_TYPE_SHORT_LOCATION = 10
+SDS_TYPE_STATUS = 128
+REASON_FOR_SENDING_EMERGENCY = 2
+
+# events fired directly from decoding, not delayed by entity updates
+EVENT_STATUS = f"{DOMAIN}_status"
+EVENT_EMERGENCY = f"{DOMAIN}_emergency"
+EVENT_GEOFENCE = f"{DOMAIN}_geofence"
+EVENT_STALE = f"{DOMAIN}_stale"
+
+# SDS types counted separately per ISSI, all others are counted together
+STATS_SDS_TYPES = (SDS_TYPE_SHORT_LOCATION, SDS_TYPE_STATUS, 130, 131, 137, 138)
+STATS_RATE_TIME_CONSTANT = 300  # Time constant in seconds of the message rates
 
 
 # Motorola specific constants
@@ -27,6 +122,9 @@ MOTOROLA_COMMANDS: dict[str, str] = {
     "+GMI": "single",
     "+CMEE": "single",
     "+CME ERROR": "single",
+    "+CMGS": "single",
+    "OK": "single",
+    "ERROR": "single",
 }
 MOTOROLA_VARIABLES_DEFAULTS: dict[str, object] = {
     # general
@@ -64,6 +162,10 @@ MOTOROLA_VARIABLES_DEFAULTS: dict[str, object] = {
     "revision": "",
     # +GMI
     "manufacturer": "",
+    # +CMGS
+    "sds_instance": "",
+    "sds_status": "",
+    "message_reference": "",
     # +CMEE & +CME ERROR & +CMEERROR
     "cme_error_code": 0,
     "cme_error_message": "",
@@ -1,16 +1,78 @@
 """Coordinator for tetraconnect integration."""
 
+from collections.abc import Mapping
+from functools import partial
 import logging
-from homeassistant.core import HomeAssistant
+from operator import itemgetter
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import ConfigEntryNotReady
-from .const import DOMAIN
+from .const import (
+    AT_FINAL_RESULTS,
+    BROKER_QUEUE_SIZE,
+    CTSP_SERVICE_PROFILES,
+    DIRECTORY_FIELDS,
+    DOMAIN,
+    EVENT_STALE,
+    PREFILTER_OPTIONS,
+    SDS_TYPE_SHORT_LOCATION,
+    SDS_TYPE_STATUS,
+    STALE_TIMEOUT,
+)
+from .broker import TetraBroker
 from .com_manager import COMManager
+from .commands import TetraCommands
+from .decoders import async_get_decoder_class
+from .directory import TetraDirectory
+from .dispatcher import TetraDispatcher
+from .geofence import TetraGeofences
+from .latency import TetraLatency
+from .longterm import TetraLongTermStatistics
+from .polling import TetraLocationPoller
+from .prefilter import split_list
+from .record import TetraRecord
+from .snapshot import TetraSnapshot
+from .statistics import TetraStatistics
+from .timer_wheel import TimerWheel
+from .tracks import TetraTracks
+from .transmit import TetraTransmitQueue
+
+if TYPE_CHECKING:
+    from .archive import TetraArchive
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _is_traced(key: str, message: Mapping[str, Any]) -> bool:
+    """Return whether a message carries its arrival time."""
+    return isinstance(message, TetraRecord) and message.received > 0
+
+
+def _is_final_result(key: str, message: Mapping[str, Any]) -> bool:
+    """Return whether a message completes an AT command."""
+    return key in AT_FINAL_RESULTS
+
+
+def _has_entity(key: str, message: Mapping[str, Any]) -> bool:
+    """Return whether a message updates an entity, plain result codes do not."""
+    return key not in ("OK", "ERROR")
+
+
+def _is_sds(key: str, message: Mapping[str, Any]) -> bool:
+    """Return whether a message is a valid SDS."""
+    return key == "+CTSDSR" and message.get("validity") == "valid"
+
+
+def _is_location(key: str, message: Mapping[str, Any]) -> bool:
+    """Return whether a message is a valid location report."""
+    return _is_sds(key, message) and message["sds_type"] == SDS_TYPE_SHORT_LOCATION
+
+
 class TetraconnectCoordinator(DataUpdateCoordinator):
     """Coordinator to manage COM data for tetraconnect."""
 
@@ -20,21 +82,287 @@ class TetraconnectCoordinator(DataUpdateCoordinator):
             hass, _LOGGER, name=f"{DOMAIN} Coordinator", update_interval=None
         )
         # self.config_entry = config_entry
+        self._setup_started = time.monotonic()
+        self.startup_timings: dict[str, float] = {}
         self.manufacturer: str = config_entry.data["manufacturer"]
         self.serial_port: str = config_entry.data["serial_port"]
         self.baudrate: int = config_entry.data["baudrate"]
 
-        self._com_manager = COMManager(self, self.serial_port, self.baudrate)
+        self.snapshot = TetraSnapshot(hass, config_entry.entry_id)
+        self.directory = TetraDirectory(hass)
+        self.geofences = TetraGeofences(hass)
+        self.tracks = TetraTracks(hass)
+        self.timers = TimerWheel(hass)
+        self.statistics = TetraStatistics()
+        self.longterm = TetraLongTermStatistics(hass)
+        self.archive: TetraArchive | None = None  # created on start, if enabled
+        self.latency = TetraLatency()
+        self.dispatcher = TetraDispatcher(hass, self.async_publish)
+
+        # directory and tracks enrich the record read by entities and queued consumers,
+        # thus run inline before them
+        self.broker = TetraBroker(hass)
+        self.broker.subscribe("latency", self._async_trace_decoded, accepts=_is_traced)
+        self.broker.subscribe("directory", self.directory.enrich, accepts=_is_sds)
+        self.broker.subscribe("tracks", self._async_track, accepts=_is_location)
+        self.broker.subscribe("entities", self.dispatcher.put, accepts=_has_entity)
+        # counts must not be lost, SDS beyond a full queue are tallied per ISSI, SDS
+        # type and status and added to the statistics on the next drain
+        self._tally: dict[tuple[str, int, int], int] = {}
+        self.broker.subscribe(
+            "statistics",
+            self._async_count,
+            BROKER_QUEUE_SIZE,
+            accepts=_is_sds,
+            overflow=self._async_tally,
+        )
+        self.broker.subscribe(
+            "geofences",
+            self._async_geofence,
+            BROKER_QUEUE_SIZE,
+            coalesce=itemgetter("issi_sen"),
+            accepts=_is_location,
+        )
+        self.worker: bool = config_entry.data.get("worker", False)
+        self.archive_enabled: bool = config_entry.data.get("archive", False)
+        self.service_profiles: list[str] = config_entry.options.get(
+            "service_profiles", list(CTSP_SERVICE_PROFILES)
+        )
+        self.prefilter_options: dict[str, str] = {
+            key: config_entry.options.get(key, "") for key in PREFILTER_OPTIONS
+        }
+
+        # created on start, optionally reading serial data in a worker process
+        self._com_manager: COMManager | None = None
+        self.commands = TetraCommands(self.write)
+        self.broker.subscribe(
+            "commands", self.commands.handle_result, accepts=_is_final_result
+        )
+        self.transmit = TetraTransmitQueue(
+            hass, self.commands.async_command, self.timers
+        )
+        self.poller = TetraLocationPoller(self.transmit, self.timers)
+        self.poll_issis: str = config_entry.options.get("poll_issis", "")
+        self.broker.subscribe(
+            "polling",
+            self.poller.update,
+            BROKER_QUEUE_SIZE,
+            coalesce=itemgetter("issi_sen"),
+            accepts=_is_location,
+        )
+
+    def decoder_cache_stats(self) -> dict[str, float] | None:
+        """Return payload cache statistics of the decoder, None if not connected."""
+        if self._com_manager is None:
+            return None
+        return self._com_manager.cache_stats()
+
+    def command_stats(self) -> dict[str, int]:
+        """Return the counters of AT commands sent to the radio."""
+        return self.commands.stats()
+
+    def prefilter_stats(self) -> dict[str, int | bool] | None:
+        """Return pre-filter counters of the decoder, None if not connected."""
+        if self._com_manager is None:
+            return None
+        return self._com_manager.prefilter_stats()
+
+    def write(self, data: bytes) -> bool:
+        """Write data to the radio, return False if not connected."""
+        return self._com_manager is not None and self._com_manager.write(data)
+
+    def mark_startup(self, stage: str) -> None:
+        """Record the time in ms from setup start to the first occurrence of a stage."""
+        if stage not in self.startup_timings:
+            self.startup_timings[stage] = round(
+                (time.monotonic() - self._setup_started) * 1000, 1
+            )
+            _LOGGER.debug(
+                "Startup stage %s reached after %s ms",
+                stage,
+                self.startup_timings[stage],
+            )
+
+    @callback
+    def _async_restore_issis(self) -> None:
+        """Seed statistics, tracks and geofences with the restored SDS per ISSI."""
+        offset = time.time() - time.monotonic()  # epoch time of monotonic time 0
+        for issi, records in self.snapshot.issis.items():
+            received = max(record.received for record in records.values())
+            self.statistics.restore(issi, received + offset)
+            location = records.get(SDS_TYPE_SHORT_LOCATION)
+            if location is not None:
+                self.tracks.update(location)
+                self.geofences.restore(location)
+
+    @callback
+    def _async_trace_decoded(self, key: str, record: TetraRecord) -> None:
+        """Stamp a record published by the decoder."""
+        record.decoded = now = time.monotonic()
+        if record.framed:
+            self.latency.add("framing", record.framed - record.received)
+        self.latency.add("decoding", now - (record.framed or record.received))
+
+    @callback
+    def _async_track(self, key: str, message: Mapping[str, Any]) -> None:
+        """Add a location report to the tracks."""
+        self.tracks.update(message)
+
+    @callback
+    def _async_count(self, key: str, message: Mapping[str, Any]) -> None:
+        """Count an SDS and restart the stale timer of its ISSI."""
+        if self._tally:
+            tally, self._tally = self._tally, {}
+            for (issi, sds_type, status), count in tally.items():
+                self.statistics.add(issi, sds_type, status, count)
+                self.longterm.add(issi, sds_type, count)
+
+        self.statistics.update(message)
+        self.longterm.update(message)
+        issi = message["issi_sen"]
+        if issi:
+            self._async_restart_stale(issi)
+
+    @callback
+    def _async_tally(self, key: str, message: Mapping[str, Any]) -> None:
+        """Tally an SDS beyond the full statistics queue, velocities are not kept."""
+        issi = message["issi_sen"]
+        if not issi:
+            return
+        sds_type = message["sds_type"]
+        status = message["tetra_status"] if sds_type == SDS_TYPE_STATUS else 0
+        tally = (issi, sds_type, status)
+        self._tally[tally] = self._tally.get(tally, 0) + 1
+        self._async_restart_stale(issi)
+
+    @callback
+    def _async_restart_stale(self, issi: str) -> None:
+        """Restart the timer firing the stale event of an ISSI."""
+        self.timers.schedule(
+            ("stale", issi), STALE_TIMEOUT, partial(self._async_stale, issi)
+        )
+
+    @callback
+    def _async_geofence(self, key: str, message: Mapping[str, Any]) -> None:
+        """Check the latest location report of an ISSI against the geofences."""
+        self.geofences.update(message)
+
+    @callback
+    def _async_stale(self, issi: str) -> None:
+        """Fire an event for an ISSI without any SDS for STALE_TIMEOUT seconds."""
+        _LOGGER.debug("No SDS from ISSI %s for %s seconds", issi, STALE_TIMEOUT)
+        event_data: dict[str, Any] = {"issi_sen": issi}
+        entry = self.directory.get(issi)
+        if entry is not None:
+            event_data.update(zip(DIRECTORY_FIELDS, entry))
+        self.hass.bus.async_fire(EVENT_STALE, event_data)
+
+    @callback
+    def async_publish(self, message: Mapping[str, Mapping[str, Any]]) -> None:
+        """Publish a message to the entities and keep it for the snapshot."""
+        for record in message.values():
+            if isinstance(record, TetraRecord) and record.decoded:
+                record.published = time.monotonic()
+                self.latency.add("dispatch", record.published - record.decoded)
+        self.snapshot.update(message)
+        self.async_set_updated_data(message)
 
     async def async_start(self):
-        """Start the COM manager."""
+        """Start the COM manager.
+
+        The last known state is restored from the snapshot first, thus entities
+        are created with it. The TETRA device is initialized by
+        async_initialize_device afterwards, thus setup is not blocked by AT command
+        round trips.
+
+        """
+        try:
+            decoder_cls = await async_get_decoder_class(self.hass, self.manufacturer)
+            await self.snapshot.async_restore(decoder_cls(self).decode_message)
+        except ValueError as e:
+            _LOGGER.error(f"Failed to restore snapshot: {e}")
+        if self.snapshot.commands:
+            self.data = dict(self.snapshot.commands)
+        self.mark_startup("snapshot_restored")
+
+        await self.directory.async_load()
+        await self.geofences.async_load()
+        self._async_restore_issis()
+        self.longterm.async_start()
+        self.transmit.async_start()
+        self.poller.configure(split_list(self.poll_issis))
+        # archive and worker are imported only if enabled, not on HA startup
+        if self.archive_enabled:
+            archive = await async_import_module(self.hass, f"{__package__}.archive")
+            self.archive = archive.TetraArchive(self.hass, self.timers)
+            self.archive.async_start()
+
+        com_manager_cls = COMManager
+        if self.worker:
+            worker = await async_import_module(self.hass, f"{__package__}.worker")
+            com_manager_cls = worker.COMWorkerManager
+        self._com_manager = com_manager_cls(self, self.serial_port, self.baudrate)
         try:
             await self._com_manager.serial_initialize(self.hass)
-            await self._com_manager.tetra_initialize()
         except Exception as e:
             _LOGGER.error(f"Failed to initialize COM manager: {e}")
             raise ConfigEntryNotReady from e
+        self.mark_startup("serial_started")
+
+    async def async_initialize_device(self):
+        """Initialize the TETRA services of the device, run as background task."""
+        if self._com_manager is None:
+            return
+        try:
+            await self._com_manager.tetra_initialize()
+        except Exception as e:
+            _LOGGER.error(f"Failed to initialize TETRA device: {e}")
+            return
+        self.mark_startup("device_initialized")
+        _LOGGER.info("Startup timings in ms: %s", self.startup_timings)
+
+    async def async_set_service_profiles(self, profiles: list[str]) -> None:
+        """Apply changed service profiles to the connected device."""
+        if profiles == self.service_profiles:
+            return
+        self.service_profiles = profiles
+        if self._com_manager is None:
+            return
+        _LOGGER.info("Applying service profiles %s", profiles)
+        try:
+            await self._com_manager.tetra_initialize()
+        except Exception as e:
+            _LOGGER.error(f"Failed to apply service profiles: {e}")
+
+    @callback
+    def set_prefilter(self, options: dict[str, str]) -> None:
+        """Apply changed pre-filter options to the data handler."""
+        if options == self.prefilter_options:
+            return
+        self.prefilter_options = options
+        _LOGGER.info("Applying SDS pre-filter %s", options)
+        if self._com_manager is not None:
+            self._com_manager.set_prefilter(options)
+
+    @callback
+    def set_poll_fleet(self, issis: str) -> None:
+        """Apply a changed fleet to poll for locations."""
+        if issis == self.poll_issis:
+            return
+        self.poll_issis = issis
+        _LOGGER.info("Polling locations of %s", issis or "no ISSIs")
+        self.poller.configure(split_list(issis))
 
     async def async_stop(self):
-        """Stop the COM manager."""
-        await self._com_manager.serial_stop()
+        """Stop the COM manager and save the snapshot."""
+        self.poller.stop()
+        await self.transmit.async_stop()
+        if self._com_manager is not None:
+            await self._com_manager.serial_stop()
+        self.broker.stop()
+        self.dispatcher.stop()
+        self.timers.stop()
+        self.longterm.async_stop()
+        if self.archive is not None:
+            await self.archive.async_stop()
+        await self.snapshot.async_save()
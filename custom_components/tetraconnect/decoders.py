@@ -0,0 +1,96 @@
+"""Registry of manufacturer specific data handlers in tetraconnect integration."""
+
+from abc import ABC, abstractmethod
+import importlib
+import logging
+from typing import TYPE_CHECKING
+
+from .const import MANUFACTURERS_LIST
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Mapping from manufacturer to the module holding its data handler class
+# The class is named like the manufacturer and must offer
+# data_handler(raw_data: bytes, received: float) -> bytes
+# add any new manufacturer here and to MANUFACTURERS_LIST
+DECODER_MODULES: dict[str, str] = {
+    "Motorola": "motorola",
+}
+
+
+def _check_manufacturer(manufacturer: str) -> str:
+    """Return the module name of the manufacturers data handler."""
+    if manufacturer not in MANUFACTURERS_LIST or manufacturer not in DECODER_MODULES:
+        raise ValueError(f"Unsupported manufacturer: {manufacturer}")
+    return f"{__package__}.{DECODER_MODULES[manufacturer]}"
+
+
+def get_decoder_class(manufacturer: str) -> type:
+    """Return the data handler class of the given manufacturer, blocking import.
+
+    Only use outside of the event loop, e.g. in the worker process.
+
+    Raises:
+        ValueError: If the manufacturer is not supported.
+
+    """
+    module = importlib.import_module(_check_manufacturer(manufacturer))
+    return getattr(module, manufacturer)
+
+
+class DecoderSink(ABC):
+    """Stand-in for coordinator and broker to run a data handler outside of HA.
+
+    Data handlers hand their records to coordinator.broker.put and fire events
+    on coordinator.hass.bus, subclasses implement put to consume the records.
+    Events are ignored.
+
+    """
+
+    class _Bus:
+        """Event bus without any listeners."""
+
+        def async_fire(self, event_type, event_data) -> None:
+            """Ignore events."""
+
+    class _Hass:
+        """HA instance offering the event bus only."""
+
+        def __init__(self) -> None:
+            """Initialize the HA stand-in."""
+            self.bus = DecoderSink._Bus()
+
+    def __init__(self, manufacturer: str) -> None:
+        """Initialize the sink."""
+        self.manufacturer = manufacturer
+        self.hass = self._Hass()
+        self.broker = self
+        # no ISSI directory outside of HA
+        self.directory: dict = {}
+
+    @abstractmethod
+    def put(self, key: str, message) -> None:
+        """Consume a decoded record."""
+
+
+async def async_get_decoder_class(hass: "HomeAssistant", manufacturer: str) -> type:
+    """Return the data handler class of the given manufacturer.
+
+    The module of the data handler is imported on first request only, thus only
+    modules of configured manufacturers are loaded.
+
+    Raises:
+        ValueError: If the manufacturer is not supported.
+
+    """
+    # HA is imported on use only, thus data handlers run without HA, see capture.py
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.importlib import async_import_module
+
+    module = await async_import_module(hass, _check_manufacturer(manufacturer))
+    _LOGGER.debug("Loaded data handler for manufacturer %s", manufacturer)
+
+    return getattr(module, manufacturer)
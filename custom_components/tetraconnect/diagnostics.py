@@ -10,6 +10,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
+from .const import DOMAIN
+
 TO_REDACT: set[str] = {
     "latitude",
     "longitude",
@@ -40,10 +42,31 @@ async def async_get_config_entry_diagnostics(
     log_path = "config/home-assistant.log"
     tetraconnect_logs = await hass.async_add_executor_job(_read_log, log_path)
 
+    coordinator = hass.data.get(DOMAIN)
+
     return {
         "entry_data": async_redact_data(data, TO_REDACT),
         "options": async_redact_data(options, TO_REDACT),
         "runtime_data": getattr(entry, "runtime_data", None),
+        "broker": coordinator.broker.stats() if coordinator else None,
+        "latency_ms": coordinator.latency.stats() if coordinator else None,
+        "transmit": coordinator.transmit.stats() if coordinator else None,
+        "commands": coordinator.command_stats() if coordinator else None,
+        "polling": coordinator.poller.stats() if coordinator else None,
+        "dispatcher": coordinator.dispatcher.stats() if coordinator else None,
+        "startup_timings": coordinator.startup_timings if coordinator else None,
+        "snapshot": coordinator.snapshot.stats() if coordinator else None,
+        "directory": coordinator.directory.stats() if coordinator else None,
+        "geofences": coordinator.geofences.stats() if coordinator else None,
+        "tracks": coordinator.tracks.stats() if coordinator else None,
+        "statistics": coordinator.statistics.stats() if coordinator else None,
+        "timers": coordinator.timers.stats() if coordinator else None,
+        "longterm": coordinator.longterm.stats() if coordinator else None,
+        "archive": (
+            coordinator.archive.stats() if coordinator and coordinator.archive else None
+        ),
+        "sds_cache": coordinator.decoder_cache_stats() if coordinator else None,
+        "prefilter": coordinator.prefilter_stats() if coordinator else None,
         "logs": tetraconnect_logs,
     }
 
@@ -0,0 +1,141 @@
+"""Directory of ISSI aliases in tetraconnect integration."""
+
+from collections.abc import Iterable, Mapping
+import csv
+import logging
+import os
+import sys
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.yaml import load_yaml
+
+from .const import DIRECTORY_FIELDS, DIRECTORY_FILES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DirectoryEntry(NamedTuple):
+    """Aliases of one ISSI, None if not given."""
+
+    callsign: str | None
+    unit: str | None
+    vehicle_type: str | None
+
+
+def _rows_from_csv(path: str) -> Iterable[Mapping[str, Any]]:
+    """Return the rows of a CSV file with a header row, blocking."""
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        return list(csv.DictReader(file))
+
+
+def _rows_from_yaml(path: str) -> Iterable[Mapping[str, Any]]:
+    """Return the rows of a YAML mapping of ISSIs to their fields, blocking."""
+    content = load_yaml(path)
+    if not isinstance(content, Mapping):
+        raise ValueError("expected a mapping of ISSIs")
+    return [{**(fields or {}), "issi": issi} for issi, fields in content.items()]
+
+
+def load_directory(path: str) -> dict[str, DirectoryEntry]:
+    """Load the ISSI directory from a CSV or YAML file, blocking.
+
+    CSV files have a header row with the columns issi, callsign, unit and
+    vehicle_type, YAML files map each ISSI to its fields. Strings are interned, thus
+    units and vehicle types shared by many ISSIs are kept once.
+
+    """
+    reader = _rows_from_yaml if path.endswith(".yaml") else _rows_from_csv
+    entries: dict[str, DirectoryEntry] = {}
+
+    def _string(value: Any) -> str | None:
+        """Return a stripped interned string, None if empty."""
+        if value is None or not str(value).strip():
+            return None
+        return sys.intern(str(value).strip())
+
+    for row in reader(path):
+        issi = str(row.get("issi") or "").strip()
+        if not issi.isdigit():
+            raise ValueError(f"invalid ISSI {issi!r}")
+        entries[sys.intern(issi)] = DirectoryEntry(
+            *(_string(row.get(field)) for field in DIRECTORY_FIELDS)
+        )
+    return entries
+
+
+class TetraDirectory:
+    """Callsign, unit and vehicle type per ISSI, added to records and events.
+
+    The directory is loaded once into a dict of interned strings and replaced as a
+    whole on reload, thus it is reloaded while the radio link stays connected.
+    Records are enriched by setting references to the strings of the directory, no
+    objects are created per message whatever the size of the directory.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty directory."""
+        self.hass = hass
+        self._entries: dict[str, DirectoryEntry] = {}
+        self.path: str | None = None
+
+    async def async_load(self) -> bool:
+        """Load the directory from the HA config directory, if there is any.
+
+        The current directory is kept if the file is invalid. Returns whether the
+        directory was loaded.
+
+        """
+        for name in DIRECTORY_FILES:
+            path = self.hass.config.path(name)
+            if await self.hass.async_add_executor_job(os.path.isfile, path):
+                break
+        else:
+            self._entries = {}
+            self.path = None
+            return True
+
+        try:
+            entries = await self.hass.async_add_executor_job(load_directory, path)
+        except (
+            OSError,
+            ValueError,
+            TypeError,
+            AttributeError,
+            HomeAssistantError,
+        ) as err:
+            _LOGGER.error("Failed to load ISSI directory from %s: %s", path, err)
+            return False
+
+        self._entries = entries
+        self.path = path
+        _LOGGER.info("Loaded %s ISSIs from %s", len(entries), path)
+        return True
+
+    def get(self, issi: str) -> DirectoryEntry | None:
+        """Return the aliases of an ISSI, None if it is not listed."""
+        return self._entries.get(issi)
+
+    @callback
+    def enrich(self, key: str, record: Mapping[str, Any]) -> None:
+        """Add the aliases of sending and receiving ISSI to an SDS record."""
+        entries = self._entries
+        entry = entries.get(record["issi_sen"])
+        if entry is not None:
+            record["callsign"], record["unit"], record["vehicle_type"] = entry
+        entry = entries.get(record["issi_rec"])
+        if entry is not None:
+            record["callsign_rec"] = entry.callsign
+
+    def stats(self) -> dict[str, Any]:
+        """Return directory statistics, e.g. for diagnostics."""
+        return {
+            "file": self.path,
+            "issis": len(self._entries),
+            "units": len({entry.unit for entry in self._entries.values()}),
+            "vehicle_types": len(
+                {entry.vehicle_type for entry in self._entries.values()}
+            ),
+        }
@@ -0,0 +1,148 @@
+"""Priority dispatching of decoded messages to entities in tetraconnect integration."""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DISPATCH_BATCH_SIZE,
+    DISPATCH_OVERLOAD_THRESHOLD,
+    SDS_TYPE_SHORT_LOCATION,
+)
+from .helpers import TetraconnectHelpers
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TetraDispatcher:
+    """Priority queue of the entity/publish stage, the entities consumer of the broker.
+
+    Decoded messages are queued in three lanes and drained in the next event loop
+    iterations, at most DISPATCH_BATCH_SIZE messages at once:
+    - high: emergency location reports and status messages, never delayed by others
+    - normal: all other messages
+    - low: location reports
+
+    If more than DISPATCH_OVERLOAD_THRESHOLD messages are pending, the dispatcher
+    switches to overload mode. In overload mode pending location reports of the same
+    ISSI are coalesced, only the latest one is kept. Overload mode ends as soon as
+    all lanes are drained.
+
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        publish: Callable[[dict[str, Mapping[str, Any]]], None],
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._publish = publish
+        self._high: deque[tuple[str, Mapping[str, Any]]] = deque()
+        self._normal: deque[tuple[str, Mapping[str, Any]]] = deque()
+        self._low: dict[object, tuple[str, Mapping[str, Any]]] = {}
+        self._low_seq = 0
+        self._drain_handle: asyncio.Handle | None = None
+        self._overload = False
+
+        self.coalesced = 0
+        self.coalesced_total = 0
+        self.overload_count = 0
+        self.max_pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of pending messages."""
+        return len(self._high) + len(self._normal) + len(self._low)
+
+    @callback
+    def put(self, key: str, message: Mapping[str, Any]) -> None:
+        """Queue a message for the entity with the given key."""
+        if TetraconnectHelpers.fast_path_event_type(message) is not None:
+            self._high.append((key, message))
+        elif message.get("sds_type") == SDS_TYPE_SHORT_LOCATION:
+            self._put_location(key, message)
+        else:
+            self._normal.append((key, message))
+
+        pending = self.pending
+        if pending > self.max_pending:
+            self.max_pending = pending
+        if not self._overload and pending > DISPATCH_OVERLOAD_THRESHOLD:
+            self._overload = True
+            self.overload_count += 1
+            _LOGGER.warning(
+                "Dispatcher overloaded with %s pending messages, coalescing location reports",
+                pending,
+            )
+
+        if self._drain_handle is None:
+            self._drain_handle = self.hass.loop.call_soon(self._drain)
+
+    def _put_location(self, key: str, message: Mapping[str, Any]) -> None:
+        """Queue a location report, replacing a pending one of the same ISSI in overload mode."""
+        if self._overload:
+            issi = message.get("issi_sen")
+            if issi in self._low:
+                # last value wins, queue position of the first report is kept
+                self._low[issi] = (key, message)
+                self.coalesced += 1
+                self.coalesced_total += 1
+                return
+        else:
+            # unique key, nothing is coalesced outside of overload mode
+            issi = self._low_seq
+            self._low_seq += 1
+
+        self._low[issi] = (key, message)
+
+    @callback
+    def _drain(self) -> None:
+        """Publish pending messages by priority, yield to the event loop after a batch."""
+        self._drain_handle = None
+
+        for _ in range(DISPATCH_BATCH_SIZE):
+            if self._high:
+                key, message = self._high.popleft()
+            elif self._normal:
+                key, message = self._normal.popleft()
+            elif self._low:
+                issi = next(iter(self._low))
+                key, message = self._low.pop(issi)
+            else:
+                break
+            self._publish({key: message})
+
+        if self.pending:
+            self._drain_handle = self.hass.loop.call_soon(self._drain)
+        elif self._overload:
+            self._overload = False
+            _LOGGER.warning(
+                "Dispatcher recovered from overload, %s location reports coalesced",
+                self.coalesced,
+            )
+            self.coalesced = 0
+
+    @callback
+    def stop(self) -> None:
+        """Cancel draining and drop all pending messages."""
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+        self._high.clear()
+        self._normal.clear()
+        self._low.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return dispatcher statistics, e.g. for diagnostics."""
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "overload": self._overload,
+            "overload_count": self.overload_count,
+            "coalesced_total": self.coalesced_total,
+        }
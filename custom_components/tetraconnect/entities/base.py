@@ -1,12 +1,50 @@
 """Contain base class for tetraconnect sensors."""
 
+from collections.abc import Hashable, Mapping
+from datetime import datetime
+import time
+from typing import Any
+
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from ..const import MIN_STATE_WRITE_INTERVAL
+
 
 class TetraBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for tetraconnect sensors."""
 
+    # attributes written to the state, only this projection of the message is stored
+    ATTRIBUTES: tuple[str, ...] = (
+        "sds_command",
+        "sds_command_desc",
+        "validity",
+        "unknown_command_message",
+        "invalid_message",
+    )
+    # additional attributes per SDS type
+    SDS_TYPE_ATTRIBUTES: dict[int, tuple[str, ...]] = {}
+    # attribute of messages rate limited separately, None for one limit per entity
+    WRITE_KEY: str | None = None
+
+    # projection per SDS type, None for messages without specific SDS type attributes
+    _projection: dict[int | None, tuple[str, ...]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Precompute the attribute projection once per sensor class."""
+        super().__init_subclass__(**kwargs)
+        cls._projection = cls._build_projection()
+
+    @classmethod
+    def _build_projection(cls) -> dict[int | None, tuple[str, ...]]:
+        """Build the attribute projection per SDS type."""
+        projection: dict[int | None, tuple[str, ...]] = {None: cls.ATTRIBUTES}
+        for sds_type, attributes in cls.SDS_TYPE_ATTRIBUTES.items():
+            projection[sds_type] = cls.ATTRIBUTES + attributes
+        return projection
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the tetraconnect sensor.
 
@@ -39,13 +77,146 @@ class TetraBaseSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = key
         self._attr_unique_id = f"{key}_{self.device_id}"
         self._attr_native_value = data.get("sds_command_desc", "Unknown")
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
         self._attr_should_poll = False
         self._attr_icon = "mdi:message-question"
 
+        # state write handling
+        self._last_written: tuple | None = None
+        # write times within the last interval and pending states per write key,
+        # both in order of their last update
+        self._write_times: dict[Hashable, float] = {}
+        self._pending: dict[Hashable, tuple] = {}
+        self._flush_unsub: CALLBACK_TYPE | None = None
+        self.skipped_writes = 0
+        # stamps of the latest message, see TetraLatency
+        self._received = 0.0
+        self._published = 0.0
+
     def update_entities(self, data):
         """Update the sensor data."""
         self._attr_native_value = self.key
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
+
+        self.async_write_changed_state()
+
+    def set_stamps(self, data: Mapping[str, Any]) -> None:
+        """Keep the stamps of a message, its latency is added on the state write."""
+        self._received = getattr(data, "received", 0.0)
+        self._published = getattr(data, "published", 0.0)
+
+    def project_attributes(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the attributes of this sensor class from the message.
+
+        Only the projected fields of a record are decoded.
+
+        """
+        keys = self._projection.get(data.get("sds_type"), self._projection[None])
+        return {key: data[key] for key in keys if key in data}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle coordinator updates.
+
+        Updates are routed to the entity of the message key by sensor.py, thus the
+        state of all other entities did not change and is not written again.
+
+        """
+        self.async_write_changed_state()
+
+    @callback
+    def async_write_changed_state(self) -> None:
+        """Write the state to HA, if state or attributes changed.
+
+        Identical states are skipped. Changed states are written at most every
+        MIN_STATE_WRITE_INTERVAL seconds per WRITE_KEY, e.g. per ISSI for a sensor
+        shared by all ISSIs. The latest state received within this interval is kept
+        per key and written with a trailing flush, when the interval has passed, thus
+        a message is only ever replaced by a later one of the same key.
+
+        """
+        if self.hass is None:
+            # entity not added yet, HA writes the current state when adding it
+            return
+
+        state = (
+            self._attr_native_value,
+            self._attr_icon,
+            self._attr_extra_state_attributes,
+        )
+        key = state[2].get(self.WRITE_KEY) if self.WRITE_KEY else None
+        if state == self._last_written:
+            self._pending.pop(key, None)
+            self.skipped_writes += 1
+            return
+
+        now = time.monotonic()
+        wait = self._write_times.get(key, 0.0) + MIN_STATE_WRITE_INTERVAL - now
+        if wait > 0:
+            self._pending.pop(key, None)
+            self._pending[key] = state
+            if self._flush_unsub is None:
+                self._flush_unsub = async_call_later(
+                    self.hass, wait, self._async_flush_state
+                )
+            return
+
+        self._pending.pop(key, None)
+        self._write_state(key, state, now)
+
+    @callback
+    def _write_state(self, key: Hashable, state: tuple, now: float) -> None:
+        """Write a state to HA and keep its write time."""
+        (
+            self._attr_native_value,
+            self._attr_icon,
+            self._attr_extra_state_attributes,
+        ) = self._last_written = state
+
+        # forget write times older than the interval, the oldest come first
+        times = self._write_times
+        times.pop(key, None)
+        while times:
+            oldest = next(iter(times))
+            if times[oldest] + MIN_STATE_WRITE_INTERVAL > now:
+                break
+            del times[oldest]
+        times[key] = now
 
         self.async_write_ha_state()
+
+        if self._published:
+            written = time.monotonic()
+            self.coordinator.latency.add("state_write", written - self._published)
+            self.coordinator.latency.add("end_to_end", written - self._received)
+            self._published = 0.0
+
+    @callback
+    def _async_flush_state(self, _now: datetime) -> None:
+        """Write the pending states whose minimum write interval has passed."""
+        self._flush_unsub = None
+        now = time.monotonic()
+        next_due: float | None = None
+        for key, state in list(self._pending.items()):
+            due = self._write_times.get(key, 0.0) + MIN_STATE_WRITE_INTERVAL
+            if due <= now:
+                del self._pending[key]
+                if state != self._last_written:
+                    self._write_state(key, state, now)
+            elif next_due is None or due < next_due:
+                next_due = due
+
+        if next_due is not None:
+            self._flush_unsub = async_call_later(
+                self.hass, next_due - now, self._async_flush_state
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending state write when the entity is removed."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+        await super().async_will_remove_from_hass()
+
+
+TetraBaseSensor._projection = TetraBaseSensor._build_projection()
@@ -8,6 +8,14 @@ from .base import TetraBaseSensor
 class CMESensor(TetraBaseSensor):
     """Sensor for CME data in tetraconnect integration."""
 
+    ATTRIBUTES = (
+        "sds_command",
+        "sds_command_desc",
+        "validity",
+        "cme_error_code",
+        "cme_error_message",
+    )
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the CME sensor."""
 
@@ -20,6 +28,6 @@ class CMESensor(TetraBaseSensor):
     def update_entities(self, data) -> None:
         """Handle updated data from the coordinator. Overwrites the base method."""
         self._attr_native_value = data.get("cme_error_message", "unknown")
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
 
-        self.async_write_ha_state()
+        self.async_write_changed_state()
@@ -8,6 +8,11 @@ from .base import TetraBaseSensor
 class ConnectionStatusSensor(TetraBaseSensor):
     """Sensor for connection status in tetraconnect integration."""
 
+    ATTRIBUTES = (
+        "connection_status",
+        "validity",
+    )
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the connection status sensor."""
 
@@ -15,12 +20,12 @@ class ConnectionStatusSensor(TetraBaseSensor):
 
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_native_value = data["connection_status"]
-        self._attr_extra_state_attributes = data
         self._attr_icon = "mdi:lan-connect"
 
     def update_entities(self, data) -> None:
         """Handle updated data from the coordinator. Overwrites the base method."""
         self._attr_native_value = data["connection_status"]
+        self._attr_extra_state_attributes = self.project_attributes(data)
 
         # update icon
         if data["connection_status"] == "connected":
@@ -28,4 +33,4 @@ class ConnectionStatusSensor(TetraBaseSensor):
         else:
             self._attr_icon = "mdi:lan-disconnect"
 
-        self.async_write_ha_state()
+        self.async_write_changed_state()
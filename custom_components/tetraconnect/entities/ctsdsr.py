@@ -8,6 +8,60 @@ from .base import TetraBaseSensor
 class CTSDRSSensor(TetraBaseSensor):
     """Sensor for CTSDRS data in tetraconnect integration."""
 
+    ATTRIBUTES = (
+        "sds_command",
+        "sds_command_desc",
+        "validity",
+        "sds_type",
+        "sds_type_desc",
+        "sds_lenght_bits",
+        "ai_service",
+        "issi_sen",
+        "issi_sen_type",
+        "issi_rec",
+        "issi_rec_type",
+        # set by the ISSI directory, if the ISSI is listed
+        "callsign",
+        "unit",
+        "vehicle_type",
+        "callsign_rec",
+    )
+    SDS_TYPE_ATTRIBUTES = {
+        # short location report
+        10: (
+            "lat",
+            "lng",
+            "velocity",
+            "direction",
+            "position_error",
+            "time_elapsed",
+            "pdu_type",
+            "type_additional_data_desc",
+            "reason_sending_desc",
+            "user_defined_data",
+            "ground_speed",
+            "heading",
+            "distance_home",
+        ),
+        # status report
+        128: ("tetra_status",),
+    }
+    # shared by the SDS of all ISSIs, rate limited per ISSI, thus the SDS of one ISSI
+    # never replaces a pending SDS of another one
+    WRITE_KEY = "issi_sen"
+    # changing with every location report, aggregated as long-term statistics instead
+    _unrecorded_attributes = frozenset(
+        {
+            "velocity",
+            "direction",
+            "position_error",
+            "time_elapsed",
+            "ground_speed",
+            "heading",
+            "distance_home",
+        }
+    )
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the CTSDRS sensor."""
 
@@ -19,6 +73,6 @@ class CTSDRSSensor(TetraBaseSensor):
     def update_entities(self, data) -> None:
         """Handle updated data from the coordinator. Overwrites the base method."""
         self._attr_native_value = data["sds_type_desc"]
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
 
-        self.async_write_ha_state()
+        self.async_write_changed_state()
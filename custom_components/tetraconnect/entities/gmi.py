@@ -8,6 +8,13 @@ from .base import TetraBaseSensor
 class GMISensor(TetraBaseSensor):
     """Sensor for "+GMI" data in tetraconnect integration."""
 
+    ATTRIBUTES = (
+        "sds_command",
+        "sds_command_desc",
+        "validity",
+        "manufacturer",
+    )
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the GMI sensor."""
 
@@ -21,6 +28,6 @@ class GMISensor(TetraBaseSensor):
     def update_entities(self, data) -> None:
         """Handle updated data from the coordinator. Overwrites the base method."""
         self._attr_native_value = data["manufacturer"]
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
 
-        self.async_write_ha_state()
+        self.async_write_changed_state()
@@ -8,6 +8,15 @@ from .base import TetraBaseSensor
 class GMMSensor(TetraBaseSensor):
     """Sensor for "+GMM" data in tetraconnect integration."""
 
+    ATTRIBUTES = (
+        "sds_command",
+        "sds_command_desc",
+        "validity",
+        "device_status",
+        "device_id",
+        "sw_version",
+    )
+
     def __init__(self, coordinator, key, data) -> None:
         """Initialize the GMM sensor."""
 
@@ -21,6 +30,6 @@ class GMMSensor(TetraBaseSensor):
     def update_entities(self, data) -> None:
         """Handle updated data from the coordinator. Overwrites the base method."""
         self._attr_native_value = data["device_id"]
-        self._attr_extra_state_attributes = data
+        self._attr_extra_state_attributes = self.project_attributes(data)
 
-        self.async_write_ha_state()
+        self.async_write_changed_state()
@@ -0,0 +1,240 @@
+"""Geofences for location reports in tetraconnect integration."""
+
+from collections.abc import Mapping
+import json
+import logging
+import math
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DIRECTORY_FIELDS,
+    EVENT_GEOFENCE,
+    GEOFENCE_CELL_SIZE,
+    GEOFENCE_FILE,
+    GEOFENCE_LEVEL_FACTOR,
+    GEOFENCE_LEVELS,
+    GEOFENCE_MAX_CELLS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EARTH_RADIUS = 6371008.8  # Mean earth radius in meters
+METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180
+
+
+class Geofence(NamedTuple):
+    """Circular geofence, radius in meters."""
+
+    name: str
+    lat: float
+    lng: float
+    radius: float
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the great circle distance in meters between two points."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float, size: float) -> tuple[int, int]:
+    """Return the grid cell of a point in a grid of cells of size degrees."""
+    return math.floor(lat / size), math.floor(lng / size)
+
+
+def _boxes(fence: Geofence) -> list[tuple[float, float, float, float]]:
+    """Return the bounding boxes of a fence, split at the antimeridian.
+
+    Fences reaching a pole span all longitudes.
+
+    """
+    dlat = fence.radius / METERS_PER_DEGREE
+    lat_min = max(fence.lat - dlat, -90.0)
+    lat_max = min(fence.lat + dlat, 90.0)
+    if lat_min <= -90 or lat_max >= 90:
+        return [(lat_min, -180.0, lat_max, 180.0)]
+
+    # widest longitude of a circle on the sphere, at a latitude towards the pole
+    dlng = math.degrees(
+        math.asin(
+            math.sin(fence.radius / EARTH_RADIUS) / math.cos(math.radians(fence.lat))
+        )
+    )
+    lng_min = fence.lng - dlng
+    lng_max = fence.lng + dlng
+    boxes = [(lat_min, max(lng_min, -180.0), lat_max, min(lng_max, 180.0))]
+    if lng_min < -180:
+        boxes.append((lat_min, lng_min + 360, lat_max, 180.0))
+    if lng_max > 180:
+        boxes.append((lat_min, -180.0, lat_max, lng_max - 360))
+    return boxes
+
+
+def load_geofences(path: str) -> list[Geofence]:
+    """Load geofences from a JSON file, blocking.
+
+    The file holds a list of objects with name, latitude, longitude and radius in
+    meters, like HA zones.
+
+    """
+    with open(path, encoding="utf-8") as file:
+        return [
+            Geofence(
+                str(fence["name"]),
+                float(fence["latitude"]),
+                float(fence["longitude"]),
+                float(fence["radius"]),
+            )
+            for fence in json.load(file)
+        ]
+
+
+class TetraGeofences:
+    """Enter and leave events of ISSIs for geofences.
+
+    Geofences are indexed once in a grid of GEOFENCE_CELL_SIZE degrees, each fence
+    is listed in all cells its bounding box touches. A location report is only
+    checked against the fences of its cell, thus the cost per report does not grow
+    with the number of fences. Fences covering more than GEOFENCE_MAX_CELLS cells
+    are indexed in the next grid level of GEOFENCE_LEVEL_FACTOR times larger cells,
+    up to GEOFENCE_LEVELS levels. A report is checked against one cell per level
+    holding fences, thus large fences do not add to the cost of every report either.
+
+    The fences each ISSI is inside of are kept per ISSI, an event is fired for each
+    change only.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the geofences."""
+        self.hass = hass
+        self.fences: list[Geofence] = []
+        # cell size and grid per level holding fences, from fine to coarse
+        self._levels: list[tuple[float, dict[tuple[int, int], list[int]]]] = []
+        self._inside: dict[Any, frozenset[int]] = {}
+
+        self.reports = 0
+        self.transitions = 0
+
+    async def async_load(self) -> None:
+        """Load the geofences from the HA config directory, if there are any."""
+        path = self.hass.config.path(GEOFENCE_FILE)
+        try:
+            fences = await self.hass.async_add_executor_job(load_geofences, path)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, KeyError) as err:
+            _LOGGER.error("Failed to load geofences from %s: %s", path, err)
+            return
+
+        self.index(fences)
+        _LOGGER.info("Loaded %s geofences from %s", len(fences), path)
+
+    def index(self, fences: list[Geofence]) -> None:
+        """Index the given geofences, replacing all previous ones."""
+        self.fences = fences
+        self._inside = {}
+        sizes = [
+            GEOFENCE_CELL_SIZE * GEOFENCE_LEVEL_FACTOR**level
+            for level in range(GEOFENCE_LEVELS)
+        ]
+        grids: list[dict[tuple[int, int], list[int]]] = [{} for _ in sizes]
+
+        for index, fence in enumerate(fences):
+            boxes = _boxes(fence)
+            for size, grid in zip(sizes, grids):
+                ranges = [
+                    (_cell(lat_min, lng_min, size), _cell(lat_max, lng_max, size))
+                    for lat_min, lng_min, lat_max, lng_max in boxes
+                ]
+                cells = sum(
+                    (high[0] - low[0] + 1) * (high[1] - low[1] + 1)
+                    for low, high in ranges
+                )
+                if cells <= GEOFENCE_MAX_CELLS or grid is grids[-1]:
+                    break
+            for low, high in ranges:
+                for lat_cell in range(low[0], high[0] + 1):
+                    for lng_cell in range(low[1], high[1] + 1):
+                        grid.setdefault((lat_cell, lng_cell), []).append(index)
+
+        self._levels = [(size, grid) for size, grid in zip(sizes, grids) if grid]
+
+    def inside(self, lat: float, lng: float) -> frozenset[int]:
+        """Return the indices of all geofences containing the point."""
+        fences = self.fences
+        return frozenset(
+            index
+            for size, grid in self._levels
+            for index in grid.get(_cell(lat, lng, size), ())
+            if haversine(lat, lng, fences[index].lat, fences[index].lng)
+            <= fences[index].radius
+        )
+
+    @callback
+    def update(self, record: Mapping[str, Any]) -> None:
+        """Check a location report, fire events for entered and left geofences."""
+        if not self.fences:
+            return
+        lat = record["lat"]
+        lng = record["lng"]
+        if lat is None or lng is None:
+            return
+
+        self.reports += 1
+        issi = record["issi_sen"]
+        inside = self.inside(lat, lng)
+        previous = self._inside.get(issi, frozenset())
+        if inside == previous:
+            return
+
+        self._inside[issi] = inside
+        # aliases set on the record by the ISSI directory
+        aliases = {
+            field: record[field] for field in DIRECTORY_FIELDS if field in record
+        }
+        changes = (("leave", previous - inside), ("enter", inside - previous))
+        for event, indices in changes:
+            for index in indices:
+                self.transitions += 1
+                self.hass.bus.async_fire(
+                    EVENT_GEOFENCE,
+                    {
+                        "event": event,
+                        "geofence": self.fences[index].name,
+                        "issi_sen": issi,
+                        "lat": lat,
+                        "lng": lng,
+                        "received": getattr(record, "received", 0.0),
+                        **aliases,
+                    },
+                )
+                _LOGGER.debug(
+                    "ISSI %s %s geofence %s", issi, event, self.fences[index].name
+                )
+
+    @callback
+    def restore(self, record: Mapping[str, Any]) -> None:
+        """Set the geofences of an ISSI from a restored report, without any event."""
+        lat = record["lat"]
+        lng = record["lng"]
+        if self.fences and lat is not None and lng is not None:
+            self._inside[record["issi_sen"]] = self.inside(lat, lng)
+
+    def stats(self) -> dict[str, int]:
+        """Return geofence statistics, e.g. for diagnostics."""
+        return {
+            "fences": len(self.fences),
+            "levels": len(self._levels),
+            "cells": sum(len(grid) for _, grid in self._levels),
+            "issis_inside": sum(1 for inside in self._inside.values() if inside),
+            "reports": self.reports,
+            "transitions": self.transitions,
+        }
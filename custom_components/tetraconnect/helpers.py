@@ -1,6 +1,19 @@
 """Several unils and tool helping handling of tetraconnect."""
 
 import logging
+from collections.abc import Iterable, Mapping
+
+from .const import (
+    CTSP_PROFILE_UNSUBSCRIBED,
+    CTSP_SERVICE_PROFILES,
+    DIRECTORY_FIELDS,
+    EVENT_EMERGENCY,
+    EVENT_STATUS,
+    REASON_FOR_SENDING_EMERGENCY,
+    SDS_TYPE_SHORT_LOCATION,
+    SDS_TYPE_STATUS,
+)
+from .record import TetraRecord
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,24 +46,84 @@ class TetraconnectHelpers:
 
         self.coordinator.async_set_updated_data(message)
 
+    @staticmethod
+    def service_profile_commands(profiles: Iterable[str]) -> list[str]:
+        """Return the +CTSP commands subscribing the given services.
+
+        Services not selected are set to CTSP_PROFILE_UNSUBSCRIBED, thus the radio
+        stops forwarding SDS which were subscribed before.
+
+        """
+        selected = set(profiles)
+        return [
+            f"AT+CTSP={profile if key in selected else CTSP_PROFILE_UNSUBSCRIBED},"
+            f"{layers}\r\n"
+            for key, (profile, layers) in CTSP_SERVICE_PROFILES.items()
+        ]
+
+    @staticmethod
+    def fast_path_event_type(message: Mapping[str, object]) -> str | None:
+        """Return the event type for status and emergency messages, None for all others."""
+        sds_type = message.get("sds_type")
+        if sds_type == SDS_TYPE_STATUS:
+            return EVENT_STATUS
+        if (
+            sds_type == SDS_TYPE_SHORT_LOCATION
+            and message.get("reason_sending") == REASON_FOR_SENDING_EMERGENCY
+        ):
+            return EVENT_EMERGENCY
+        return None
+
+    def fire_fast_path_event(self, record: TetraRecord) -> None:
+        """Fire a HA event for status and emergency messages.
+
+        Events are fired straight from decoding, thus automations are triggered
+        without waiting for the dispatcher and entity state writes.
+
+        """
+        event_type = self.fast_path_event_type(record)
+        if event_type is None:
+            return
+
+        event_data: dict[str, object] = {
+            "issi_sen": record["issi_sen"],
+            "issi_rec": record["issi_rec"],
+            "received": record.received,
+        }
+        entry = self.coordinator.directory.get(record["issi_sen"])
+        if entry is not None:
+            event_data.update(zip(DIRECTORY_FIELDS, entry))
+        if event_type == EVENT_STATUS:
+            event_data["status"] = record["tetra_status"]
+        else:
+            event_data["lat"] = record["lat"]
+            event_data["lng"] = record["lng"]
+
+        self.coordinator.hass.bus.async_fire(event_type, event_data)
+        _LOGGER.debug("Fired event %s with data %s", event_type, event_data)
+
     def update_entities(
         self,
-        data_dict: dict[str, str],
+        data_dict: Mapping[str, object],
     ) -> None:
         """Create a message based on the given dictionary.
 
         The first key will be the key of the message, and the rest will be the content. Finally
         a HA entity will be created or updated with the message. The first key will be used as the entity ID.
+        Messages are handed to the coordinators broker, which publishes them to all consumers.
+
+        Records are passed on as they are, as a new record is created for each message.
+        Thus its fields are decoded only if an entity really reads them.
 
         Args:
-            data_dict (dict[str, str]): Dictionary containing variables to compose to a HA entity message.
+            data_dict (Mapping[str, object]): Dictionary or record containing variables to compose to a HA entity message.
 
         Raises:
-            TypeError: If data_dict is not a dictionary.
+            TypeError: If data_dict is not a dictionary or record.
             ValueError: If data_dict is empty or does not contain valid keys.
 
         """
-        if not isinstance(data_dict, dict):
+        if not isinstance(data_dict, Mapping):
             _LOGGER.error("Data must be a dictionary, got %s", type(data_dict))
             raise TypeError("Data must be a dictionary")
 
@@ -64,7 +137,9 @@ class TetraconnectHelpers:
             #     k: v for k, v in data_dict.items() if v not in ("", 0, None)
             # }
 
-            message: dict[str, str] = dict(data_dict)
+            message: Mapping[str, object] = (
+                data_dict if isinstance(data_dict, TetraRecord) else dict(data_dict)
+            )
 
             if next(iter(message), None) != "sds_command":
                 first_key = next(iter(message), None)
@@ -72,8 +147,7 @@ class TetraconnectHelpers:
                 first_key = message["sds_command"]
 
             if first_key is not None:
-                new_message = {first_key: message}
-                self.coordinator.async_set_updated_data(new_message)
+                self.coordinator.broker.put(first_key, message)
 
                 _LOGGER.debug(
                     "Updated entity with message %s for key %s",
@@ -0,0 +1,61 @@
+"""Latency of the processing stages in tetraconnect integration."""
+
+from array import array
+
+from .const import LATENCY_SAMPLES, LATENCY_STAGES
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    """Return the nearest rank percentile of sorted samples."""
+    index = max(0, -(-len(samples) * percent // 100) - 1)
+    return samples[index]
+
+
+class TetraLatency:
+    """Latency percentiles per stage over the last LATENCY_SAMPLES messages.
+
+    Records carry the monotonic time the last byte of their message arrived, and
+    the times they passed each stage:
+    - framing: from arrival until the message was split from the serial data
+    - decoding: until the record was published to the broker, fast path events are
+      fired right before
+    - dispatch: until the record was published to the entities by the coordinator
+    - state_write: until the state was written by the entity
+    - end_to_end: from arrival until the state was written
+
+    Samples are kept in a ring buffer per stage, percentiles are computed on request
+    only.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty ring buffers."""
+        self._samples = {
+            stage: array("d", [0.0]) * LATENCY_SAMPLES for stage in LATENCY_STAGES
+        }
+        self._counts = dict.fromkeys(LATENCY_STAGES, 0)
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add the latency of a stage."""
+        count = self._counts[stage]
+        self._samples[stage][count % LATENCY_SAMPLES] = seconds
+        self._counts[stage] = count + 1
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """Return count and p50, p95, p99 and max in ms per stage."""
+        stats: dict[str, dict[str, float | int]] = {}
+        for stage, samples in self._samples.items():
+            count = self._counts[stage]
+            if not count:
+                stats[stage] = {"count": 0}
+                continue
+            recent = sorted(samples[: min(count, LATENCY_SAMPLES)])
+            stats[stage] = {
+                "count": count,
+                **{
+                    f"p{percent}": round(_percentile(recent, percent) * 1000, 2)
+                    for percent in (50, 95, 99)
+                },
+                "max": round(recent[-1] * 1000, 2),
+            }
+        return stats
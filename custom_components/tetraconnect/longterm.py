@@ -0,0 +1,207 @@
+"""Long-term statistics of ISSIs in tetraconnect integration."""
+
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timezone
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+
+from .const import (
+    DOMAIN,
+    LONGTERM_BUCKET,
+    LONGTERM_EMIT_SECOND,
+    SDS_TYPE_SHORT_LOCATION,
+    SDS_TYPE_STATUS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_PERIOD = 3600  # Recorder external statistics are hourly
+_BUCKETS = _PERIOD // LONGTERM_BUCKET
+
+
+class _Values:
+    """Count, sum, min and max of values within one hour."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+
+class TetraLongTermStatistics:
+    """Hourly long-term statistics per ISSI, aggregated in memory.
+
+    Per ISSI mean, min and max are kept of:
+    - velocity: reported velocity of location reports in km/h
+    - messages: SDS per LONGTERM_BUCKET seconds
+    - status: status messages per LONGTERM_BUCKET seconds
+
+    Every message updates the aggregates of the current hour only. Shortly after
+    each full hour the aggregates are handed to the recorder as external
+    statistics, thus dashboards load long ranges from the statistics tables instead
+    of every single state change.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the long-term statistics."""
+        self.hass = hass
+        self._hour = self._hour_of(time.time())
+        self._velocity: dict[str, _Values] = {}
+        self._messages: dict[str, array] = {}
+        self._status: dict[str, array] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+        self.emitted = 0
+
+    @staticmethod
+    def _hour_of(timestamp: float) -> int:
+        """Return the start of the hour of a timestamp."""
+        return int(timestamp // _PERIOD) * _PERIOD
+
+    @callback
+    def async_start(self) -> None:
+        """Emit the statistics of each hour shortly after it ended."""
+        self._unsub = async_track_utc_time_change(
+            self.hass, self._async_emit, minute=0, second=LONGTERM_EMIT_SECOND
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop emitting, the statistics of the current hour are dropped."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def update(self, record: Mapping[str, Any]) -> None:
+        """Add an SDS to the aggregates of the current hour."""
+        issi = record["issi_sen"]
+        if not issi:
+            return
+
+        sds_type = record["sds_type"]
+        self.add(issi, sds_type)
+        if sds_type == SDS_TYPE_SHORT_LOCATION:
+            velocity = record["velocity"]
+            if isinstance(velocity, int):
+                values = self._velocity.get(issi)
+                if values is None:
+                    values = self._velocity[issi] = _Values()
+                values.add(velocity)
+
+    @callback
+    def add(self, issi: str, sds_type: int, count: int = 1) -> None:
+        """Count SDS of an ISSI of one SDS type in the current bucket."""
+        now = time.time()
+        if now >= self._hour + _PERIOD:
+            self._async_emit()
+        bucket = int(now - self._hour) // LONGTERM_BUCKET
+
+        counts = self._messages.get(issi)
+        if counts is None:
+            counts = self._messages[issi] = array("L", [0]) * _BUCKETS
+        counts[bucket] += count
+
+        if sds_type == SDS_TYPE_STATUS:
+            counts = self._status.get(issi)
+            if counts is None:
+                counts = self._status[issi] = array("L", [0]) * _BUCKETS
+            counts[bucket] += count
+
+    @callback
+    def _async_emit(self, now: datetime | None = None) -> None:
+        """Hand the aggregates of the passed hour to the recorder and reset them."""
+        if time.time() < self._hour + _PERIOD:
+            return
+
+        start = datetime.fromtimestamp(self._hour, timezone.utc)
+        velocity, messages, status = self._velocity, self._messages, self._status
+        self._hour = self._hour_of(time.time())
+        self._velocity, self._messages, self._status = {}, {}, {}
+
+        if "recorder" not in self.hass.config.components:
+            return
+
+        # recorder is imported on first emission only, not on startup
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        try:
+            from homeassistant.components.recorder.models import StatisticMeanType
+        except ImportError:  # HA before 2025.3
+            mean_type: dict[str, Any] = {"has_mean": True}
+        else:
+            mean_type = {"mean_type": StatisticMeanType.ARITHMETIC}
+
+        series: list[tuple[str, str, str | None, float, float, float]] = []
+        for issi, values in velocity.items():
+            series.append(
+                (
+                    f"velocity_{issi}",
+                    f"ISSI {issi} velocity",
+                    "km/h",
+                    values.total / values.count,
+                    values.min,
+                    values.max,
+                )
+            )
+        for name, counts_by_issi in (("messages", messages), ("status", status)):
+            for issi, counts in counts_by_issi.items():
+                series.append(
+                    (
+                        f"{name}_{issi}",
+                        f"ISSI {issi} {name} per {LONGTERM_BUCKET // 60} min",
+                        None,
+                        sum(counts) / _BUCKETS,
+                        min(counts),
+                        max(counts),
+                    )
+                )
+
+        for key, name, unit, mean, minimum, maximum in series:
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    **mean_type,
+                    has_sum=False,
+                    name=name,
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{key}",
+                    unit_of_measurement=unit,
+                ),
+                [StatisticData(start=start, mean=mean, min=minimum, max=maximum)],
+            )
+        self.emitted += len(series)
+        _LOGGER.debug("Emitted %s long-term statistics for %s", len(series), start)
+
+    def stats(self) -> dict[str, int]:
+        """Return long-term statistics counters, e.g. for diagnostics."""
+        return {
+            "issis": len(self._messages),
+            "emitted": self.emitted,
+        }
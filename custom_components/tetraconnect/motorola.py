@@ -1,10 +1,14 @@
 """Handle communication with Motorola devices."""
 
+from collections import OrderedDict
 import logging
 import re
+import time
 
-from .const import MOTOROLA_VARIABLES_DEFAULTS, MOTOROLA_COMMANDS
+from .const import MOTOROLA_VARIABLES_DEFAULTS, MOTOROLA_COMMANDS, SDS_CACHE_SIZE
 from .helpers import TetraconnectHelpers
+from .prefilter import TetraPreFilter
+from .record import TetraRecord
 from .tetra_mappings import Mappings
 
 _LOGGER = logging.getLogger(__name__)
@@ -13,6 +17,8 @@ _LOGGER = logging.getLogger(__name__)
 class Motorola:
     """Class to handle Motorola communication."""
 
+    VARIABLES_DEFAULTS = MOTOROLA_VARIABLES_DEFAULTS
+
     def __init__(self, coordinator) -> None:
         """Initialize the Motorola communication handler."""
         self.coordinator = coordinator
@@ -22,14 +28,48 @@ class Motorola:
         self._incomplete_messages: list[str] = []
         self._invalid_messages: list[str] = []
         self._buffer: list[str] = []
-        self._motorola_variables: dict = MOTOROLA_VARIABLES_DEFAULTS.copy()
+        self._received: float = 0.0
+        self._framed: float = 0.0
+        self._motorola_variables = TetraRecord(MOTOROLA_VARIABLES_DEFAULTS)
 
         self.mappings = Mappings()
         self.helpers = TetraconnectHelpers(coordinator)
-
-    def data_handler(self, raw_data) -> bytes:
+        self.prefilter = TetraPreFilter()
+
+        # decoded state of recent SDS payloads, by SDS type and payload
+        self._sds_cache: OrderedDict[tuple[int, str], tuple] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # decoders for lazily decoded fields, built once and shared by all records
+        self._command_decoders = {
+            "sds_command_desc": self._decode_sds_command_desc,
+        }
+        self._ctsdsr_decoders = {
+            **self._command_decoders,
+            "sds_type_desc": self._decode_sds_type_desc,
+        }
+        self._sds_type_10_decoders = {
+            **self._ctsdsr_decoders,
+            "pdu_type": self._decode_pdu_type,
+            "time_elapsed": self._decode_time_elapsed,
+            "lng": self._decode_lng,
+            "lat": self._decode_lat,
+            "position_error": self._decode_position_error,
+            "velocity": self._decode_velocity,
+            "direction": self._decode_direction,
+            "type_additional_data_desc": self._decode_type_additional_data_desc,
+            "reason_sending": self._decode_reason_sending,
+            "reason_sending_desc": self._decode_reason_sending_desc,
+            "user_defined_data": self._decode_user_defined_data,
+        }
+
+    def data_handler(self, raw_data, received: float = 0.0) -> bytes:
         """Handle incoming serial data from Motorola devices.
 
+        Received is the monotonic time the last chunk of raw data arrived, it is
+        carried by every record decoded from this data.
+
         Steps:
         - decoding
         - parsing into lines while cleaning up
@@ -48,6 +88,7 @@ class Motorola:
         self._complete_messages = []
         self._incomplete_messages = []
         self._invalid_messages = []
+        self._received = received
 
         # decode raw data
         try:
@@ -67,7 +108,10 @@ class Motorola:
             _LOGGER.debug("##### Start parsing decoded data #####")
             try:
                 self._parse_decoded_data()
+                if self.prefilter.active:
+                    self._filter_complete_messages()
                 self._check_user_data_length()
+                self._framed = time.monotonic() if received else 0.0
                 _LOGGER.debug("##### End parsing decoded data #####")
             except (
                 AttributeError,
@@ -87,6 +131,7 @@ class Motorola:
                 try:
                     self._process_sds_command(msg)
                     self._process_sds_type()
+                    self.helpers.fire_fast_path_event(self._motorola_variables)
                     self.helpers.update_entities(self._motorola_variables)
                     _LOGGER.debug("##### End processing complete messages #####")
 
@@ -128,6 +173,16 @@ class Motorola:
 
         return self.raw_returns
 
+    def decode_message(self, raw_message: str) -> TetraRecord:
+        """Decode a single complete message, e.g. restored from a snapshot.
+
+        The message must be a parsed message line as kept in TetraRecord.raw.
+
+        """
+        self._process_sds_command(raw_message)
+        self._process_sds_type()
+        return self._motorola_variables
+
     def _parse_decoded_data(self):
         """Parse the decoded data into complete and incomplete messages."""
 
@@ -149,7 +204,12 @@ class Motorola:
         for i, line in enumerate(self._buffer):
             line = line.replace("\r\nOK\r\n", "")
             line = line.replace(":", ",")
-            line = line.replace(" ", "")
+            # spaces are removed, except within command headers like +CME ERROR
+            header, separator, rest = line.partition(",")
+            if header.startswith("+"):
+                line = header.strip() + separator + rest.replace(" ", "")
+            else:
+                line = line.replace(" ", "")
             line = line.replace("\r", "").replace("\n", "")
             self._buffer[i] = line
 
@@ -157,7 +217,7 @@ class Motorola:
         self._buffer = [
             line
             for line in self._buffer
-            if line and line != "OK" and not re.fullmatch(r"[\r\n]+", line)
+            if line and not re.fullmatch(r"[\r\n]+", line)
         ]
 
         if not self._buffer:
@@ -169,7 +229,7 @@ class Motorola:
             line = self._buffer[i]
 
             # case: line not starting with '+' indicating an invalid message (we may never receive another header BEFORE this line)
-            if not line.startswith("+"):
+            if not self._is_header(line):
                 if i == 0:
                     _LOGGER.debug(
                         "Received first line without message header: %s, treating as invalid message",
@@ -195,8 +255,10 @@ class Motorola:
                 combined_line = line
                 j = i + 1
                 # Prüfe, ob es eine weitere Zeile gibt
-                if j < len(self._buffer) and not self._buffer[j].startswith("+"):
-                    while j < len(self._buffer) and not self._buffer[j].startswith("+"):
+                if j < len(self._buffer) and not self._is_header(self._buffer[j]):
+                    while j < len(self._buffer) and not self._is_header(
+                        self._buffer[j]
+                    ):
                         combined_line += "," + self._buffer[j]
                         j += 1
                     self._complete_messages.append(combined_line)
@@ -227,6 +289,30 @@ class Motorola:
                 self._complete_messages.append(line)
                 i += 1
 
+    @staticmethod
+    def _is_header(line: str) -> bool:
+        """Return whether a line starts a message.
+
+        Besides commands starting with '+' final result codes like OK, which
+        complete AT commands, are messages on their own.
+
+        """
+        return line.startswith("+") or line in MOTOROLA_COMMANDS
+
+    def _filter_complete_messages(self):
+        """Drop SDS rejected by the pre-filter, matched on their header only.
+
+        Runs before any user data checks or decoding, thus filtered SDS cost a split
+        and a few lookups and create no record.
+
+        """
+        accepts = self.prefilter.accepts
+        self._complete_messages = [
+            message
+            for message in self._complete_messages
+            if not message.startswith("+CTSDSR") or accepts(message.split(",", 7))
+        ]
+
     def _check_user_data_length(self):
         """Check the user data length in complete messages.
 
@@ -272,20 +358,23 @@ class Motorola:
                     self._complete_messages.remove(message)
 
     def _process_sds_command(self, raw_message):
-        """Initialize SDS variables from the raw message."""
+        """Initialize SDS variables from the raw message.
 
-        # clear SDS variables to avoid data confusion
-        for key, default in MOTOROLA_VARIABLES_DEFAULTS.items():
-            self._motorola_variables[key] = default
+        A new record is created for each message, so no data is mixed up between
+        messages. Descriptions are decoded lazily on first access.
+
+        """
+
+        self._motorola_variables = TetraRecord(
+            MOTOROLA_VARIABLES_DEFAULTS, raw_message, self._received, self._framed
+        )
 
         # split message
         message = raw_message.split(",")
 
         try:
             self._motorola_variables["sds_command"] = message[0]
-            self._motorola_variables["sds_command_desc"] = self.mappings.sds_command(
-                self._motorola_variables["sds_command"]
-            )
+            self._motorola_variables.defer(self._command_decoders)
 
             match self._motorola_variables["sds_command"]:
                 # +CTSDSR: short data service command
@@ -298,11 +387,8 @@ class Motorola:
                         self._motorola_variables["issi_rec_type"] = message[5]
                         self._motorola_variables["sds_lenght_bits"] = message[6]
                         self._motorola_variables["sds_type"] = int(message[7][0:2], 16)
-                        self._motorola_variables["sds_content"] = message[7]
-
-                        self._motorola_variables["sds_type_desc"] = (
-                            self.mappings.sds_type(self._motorola_variables["sds_type"])
-                        )
+                        self._motorola_variables.payload = message[7]
+                        self._motorola_variables.defer(self._ctsdsr_decoders)
 
                     except IndexError:
                         _LOGGER.warning(
@@ -350,6 +436,26 @@ class Motorola:
                             "Unexpected GMR SDS format: %s",
                             message,
                         )
+                # +CMGS: <SDS instance>[,<SDS status>[,<message reference>]],
+                # confirmation of a sent SDS
+                case "+CMGS":
+                    try:
+                        self._motorola_variables["sds_instance"] = message[1]
+                        if len(message) > 2:
+                            self._motorola_variables["sds_status"] = message[2]
+                        if len(message) > 3:
+                            self._motorola_variables["message_reference"] = message[3]
+                        _LOGGER.debug("Received SDS send confirmation: +CMGS")
+                    except IndexError:
+                        _LOGGER.warning(
+                            "Unexpected CMGS SDS format: %s",
+                            message,
+                        )
+
+                # final result codes of AT commands, see TetraCommands
+                case "OK" | "ERROR":
+                    _LOGGER.debug("Received final result code: %s", message[0])
+
                 # +CMEE: <extended error report> or +CME ERROR: <extended error report code>
                 case "+CMEE" | "+CME ERROR":
                     try:
@@ -386,6 +492,43 @@ class Motorola:
             )
 
     def _process_sds_type(self):
+        """Decode the SDS type specific fields, reusing the state of equal payloads.
+
+        Radios often resend identical status messages and location reports. The
+        decoded state of the last SDS_CACHE_SIZE payloads is kept, records with the
+        same SDS type and payload share it and skip decoding.
+
+        """
+        record = self._motorola_variables
+        if record["sds_command"] != "+CTSDSR":
+            return
+
+        key = (record["sds_type"], record.payload)
+        state = self._sds_cache.get(key)
+        if state is not None:
+            self._sds_cache.move_to_end(key)
+            self.cache_hits += 1
+            record.apply_payload_state(state)
+            return
+
+        self.cache_misses += 1
+        since = record.eager_count
+        self._decode_sds_type()
+        self._sds_cache[key] = record.payload_state(since)
+        if len(self._sds_cache) > SDS_CACHE_SIZE:
+            self._sds_cache.popitem(last=False)
+
+    def cache_stats(self) -> dict[str, float]:
+        """Return statistics of the payload cache, e.g. for diagnostics."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._sds_cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_ratio": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _decode_sds_type(self):
         """Create messages based on the SDS command and type."""
         if self._motorola_variables["sds_command"] == "+CTSDSR":
             # check for sds status and process data
@@ -394,7 +537,7 @@ class Motorola:
                 case 10:
                     _LOGGER.debug(
                         "Starting short location report message handling for message: %s",
-                        self._motorola_variables["sds_content"],
+                        self._motorola_variables.payload,
                     )
                     self._handle_sds_type_10()
 
@@ -402,10 +545,10 @@ class Motorola:
                 case 128:
                     _LOGGER.debug(
                         "Starting status message handling for message: %s",
-                        self._motorola_variables["sds_content"],
+                        self._motorola_variables.payload,
                     )
                     self._motorola_variables["tetra_status"] = (
-                        int(self._motorola_variables["sds_content"][2:4], 16) - 2
+                        int(self._motorola_variables.payload[2:4], 16) - 2
                     )
 
                 # SDS long location report / location information protocol, sds type 130
@@ -438,18 +581,19 @@ class Motorola:
                         "Received unknown sds type %s for command %s, abort message handling for message: %s",
                         self._motorola_variables["ai_service"],
                         self._motorola_variables["sds_command"],
-                        self._motorola_variables["sds_content"],
+                        self._motorola_variables.payload,
                     )
 
-            # delete sds_content to avoid data confusion
-            self._motorola_variables["sds_content"] = ""
+            # sds_content is not part of the attributes to avoid data confusion, the
+            # raw payload is kept in the record only
 
     def _process_invalid_message(self, raw_message):
         """Prepare invalid messages for sensor handling."""
 
-        # reset sds_variables to avoid data multiplication
-        for key, default in MOTOROLA_VARIABLES_DEFAULTS.items():
-            self._motorola_variables[key] = default
+        # new record to avoid data multiplication
+        self._motorola_variables = TetraRecord(
+            MOTOROLA_VARIABLES_DEFAULTS, raw_message, self._received, self._framed
+        )
 
         message = raw_message.split(",")
 
@@ -474,16 +618,23 @@ class Motorola:
             )
 
     def _handle_sds_type_10(self) -> None:
-        """Handle SDS short location report / location information protocol '10'."""
+        """Handle SDS short location report / location information protocol '10'.
+
+        Only the payload is converted to its binary representation here. All fields
+        are decoded on first access by the _decode_* methods below.
+
+        """
 
         # Convert hex to bin
         try:
-            bin_string = self._motorola_variables["sds_content"][2:]
-            bin_string = bin(int(bin_string, 16))[2:].zfill(4 * len(bin_string))
+            hex_string = self._motorola_variables.payload[2:]
+            self._motorola_variables.bits = bin(int(hex_string, 16))[2:].zfill(
+                4 * len(hex_string)
+            )
         except (ValueError, IndexError) as err:
             _LOGGER.error(
                 "Error converting SDS content for short location report: %s, error: %s",
-                self._motorola_variables.get("sds_content", ""),
+                self._motorola_variables.payload,
                 err,
             )
             self._motorola_variables["lng"] = None
@@ -495,114 +646,105 @@ class Motorola:
             self._motorola_variables["user_defined_data"] = None
             return
 
-        # Extract data
-        try:
-            pdu_type_bin = bin_string[0:2]
-            time_elapsed_bin = bin_string[2:4]
-            lng_bin = bin_string[4:29]
-            lat_bin = bin_string[29:53]
-            position_error_bin = bin_string[53:56]
-            horizontal_velocity_bin = bin_string[56:63]
-            travel_direction_bin = bin_string[63:67]
-            type_add_data_bin = bin_string[67:68]
-            reason_sending_bin = bin_string[68:76]
-            user_def_data_bin = bin_string[76:84]
-        except IndexError as err:
-            _LOGGER.error(
-                "Error extracting data from SDS content: %s, error: %s",
-                self._motorola_variables.get("sds_content", ""),
-                err,
-            )
-            self._motorola_variables["lng"] = None
-            self._motorola_variables["lat"] = None
-            self._motorola_variables["velocity"] = "unknown"
-            self._motorola_variables["direction"] = "unknown"
-            self._motorola_variables["position_error"] = "unknown"
-            self._motorola_variables["reason_sending_desc"] = "unknown"
-            self._motorola_variables["user_defined_data"] = None
-            return
+        self._motorola_variables.defer(self._sds_type_10_decoders)
+
+    def _decode_sds_command_desc(self, record: TetraRecord) -> str:
+        """Decode the description of the SDS command."""
+        return self.mappings.sds_command(record["sds_command"])
+
+    def _decode_sds_type_desc(self, record: TetraRecord) -> str:
+        """Decode the description of the SDS type."""
+        return self.mappings.sds_type(record["sds_type"])
 
-        # Conversion and calculating (jeweils mit try/except, falls nötig)
+    def _decode_pdu_type(self, record: TetraRecord) -> int | None:
+        """Decode the PDU type of a short location report."""
         try:
-            self._motorola_variables["pdu_type"] = int(pdu_type_bin, 2)
+            return int(record.bits[0:2], 2)
         except ValueError:
-            self._motorola_variables["pdu_type"] = None
+            return None
 
+    def _decode_time_elapsed(self, record: TetraRecord) -> str | None:
+        """Decode the time elapsed of a short location report."""
         try:
-            self._motorola_variables["time_elapsed"] = self.mappings.time_elapsed(
-                int(time_elapsed_bin, 2)
-            )
+            return self.mappings.time_elapsed(int(record.bits[2:4], 2))
         except ValueError:
-            self._motorola_variables["time_elapsed"] = None
+            return None
 
-        # Longitude
+    def _decode_lng(self, record: TetraRecord) -> float | None:
+        """Decode the longitude of a short location report."""
         try:
-            lng = int(lng_bin, 2)
+            lng = int(record.bits[4:29], 2)
             if lng >= 2**24:
                 lng -= 2**25
-            self._motorola_variables["lng"] = lng * (360 / 2**25)
+            return lng * (360 / 2**25)
         except ValueError:
-            self._motorola_variables["lng"] = None
+            return None
 
-        # Latitude
+    def _decode_lat(self, record: TetraRecord) -> float | None:
+        """Decode the latitude of a short location report."""
         try:
-            lat = int(lat_bin, 2)
+            lat = int(record.bits[29:53], 2)
             if lat >= 2**23:
                 lat -= 2**24
-            self._motorola_variables["lat"] = lat * (180 / 2**24)
+            return lat * (180 / 2**24)
         except ValueError:
-            self._motorola_variables["lat"] = None
+            return None
 
-        # Position Error
+    def _decode_position_error(self, record: TetraRecord) -> str:
+        """Decode the position error of a short location report."""
         try:
-            self._motorola_variables["position_error"] = self.mappings.position_error(
-                position_error_bin
-            )
+            return self.mappings.position_error(record.bits[53:56])
         except Exception:
-            self._motorola_variables["position_error"] = "unknown"
+            return "unknown"
 
-        # Horizontal Velocity
+    def _decode_velocity(self, record: TetraRecord) -> int | str:
+        """Decode the horizontal velocity of a short location report."""
         try:
-            horizontal_velocity = int(horizontal_velocity_bin, 2)
+            horizontal_velocity = int(record.bits[56:63], 2)
             if horizontal_velocity < 28:
-                self._motorola_variables["velocity"] = horizontal_velocity
-            elif 28 <= horizontal_velocity < 127:
-                self._motorola_variables["velocity"] = round(
-                    16 * (1 + 0.038) ** (horizontal_velocity - 13)
-                )
-            else:
-                self._motorola_variables["velocity"] = "unknown"
+                return horizontal_velocity
+            if 28 <= horizontal_velocity < 127:
+                return round(16 * (1 + 0.038) ** (horizontal_velocity - 13))
+            return "unknown"
         except ValueError:
-            self._motorola_variables["velocity"] = "unknown"
+            return "unknown"
 
-        # Travel Direction
+    def _decode_direction(self, record: TetraRecord) -> str:
+        """Decode the travel direction of a short location report."""
         try:
-            self._motorola_variables["direction"] = self.mappings.direction(
-                travel_direction_bin
-            )
+            return self.mappings.direction(record.bits[63:67])
         except Exception:
-            self._motorola_variables["direction"] = "unknown"
+            return "unknown"
 
-        # Type of Additional Data
+    def _decode_type_additional_data_desc(self, record: TetraRecord) -> str:
+        """Decode the type of additional data of a short location report."""
         try:
-            type_additional_data = int(type_add_data_bin, 2)
-            self._motorola_variables["type_additional_data_desc"] = (
-                self.mappings.sds_type_add_data(type_additional_data)
-            )
+            type_additional_data = int(record.bits[67:68], 2)
+            return self.mappings.sds_type_add_data(type_additional_data)
         except ValueError:
-            self._motorola_variables["type_additional_data_desc"] = "unknown"
+            return "unknown"
+
+    def _decode_reason_sending(self, record: TetraRecord) -> int | None:
+        """Decode the reason for sending code of a short location report.
 
-        # Reason for Sending
+        The code is not part of the attributes, but used for prioritizing messages.
+
+        """
         try:
-            reason_sending = int(reason_sending_bin, 2)
-            self._motorola_variables["reason_sending_desc"] = (
-                self.mappings.reason_for_sending(reason_sending)
-            )
+            return int(record.bits[68:76], 2)
         except ValueError:
-            self._motorola_variables["reason_sending_desc"] = "unknown"
+            return None
 
-        # User Defined Data
+    def _decode_reason_sending_desc(self, record: TetraRecord) -> str:
+        """Decode the reason for sending of a short location report."""
+        reason_sending = record["reason_sending"]
+        if reason_sending is None:
+            return "unknown"
+        return self.mappings.reason_for_sending(reason_sending)
+
+    def _decode_user_defined_data(self, record: TetraRecord) -> int | None:
+        """Decode the user defined data of a short location report."""
         try:
-            self._motorola_variables["user_defined_data"] = int(user_def_data_bin, 2)
+            return int(record.bits[76:84], 2)
         except ValueError:
-            self._motorola_variables["user_defined_data"] = None
+            return None
@@ -0,0 +1,135 @@
+"""Polling of the fleet's locations in tetraconnect integration."""
+
+from collections.abc import Iterable, Mapping
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import callback
+
+from .const import (
+    POLL_DISTANCE,
+    POLL_MAX_INTERVAL,
+    POLL_MAX_OUTSTANDING,
+    POLL_MIN_INTERVAL,
+    POLL_RESPONSE_TIMEOUT,
+    POLL_TICK,
+    REASON_SENDING_IMMEDIATE_REQUEST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Unit:
+    """Polling state of one ISSI of the fleet."""
+
+    __slots__ = ("last_report", "speed", "requested")
+
+    def __init__(self) -> None:
+        """Initialize an ISSI without any report."""
+        self.last_report = float("-inf")  # monotonic time
+        self.speed = 0.0  # km/h
+        self.requested = 0.0  # monotonic time of the outstanding request, 0 if none
+
+    def interval(self) -> float:
+        """Return the polling interval, shorter the faster the ISSI moves."""
+        if self.speed <= 0:
+            return POLL_MAX_INTERVAL
+        interval = POLL_DISTANCE / (self.speed / 3.6)
+        return min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+
+
+class TetraLocationPoller:
+    """Requests immediate location reports of the fleet's ISSIs.
+
+    An ISSI is due when it did not report its location for its interval, whether
+    on its own or on request. The interval is the time to travel POLL_DISTANCE at
+    the last known speed, from POLL_MIN_INTERVAL up to POLL_MAX_INTERVAL for ISSIs
+    standing still. Thus ISSIs reporting on their own are not polled at all.
+
+    Every POLL_TICK seconds the most overdue ISSI is requested, thus requests are
+    spread instead of sent in bursts. At most POLL_MAX_OUTSTANDING requests are
+    awaiting their report, requests without a report are given up after
+    POLL_RESPONSE_TIMEOUT seconds. Requests are sent by the transmit queue.
+
+    """
+
+    def __init__(self, transmit, timers) -> None:
+        """Initialize the poller without a fleet."""
+        self._transmit = transmit
+        self._timers = timers
+        self._units: dict[str, _Unit] = {}
+
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+
+    @callback
+    def configure(self, issis: Iterable[str]) -> None:
+        """Set the fleet, known ISSIs keep their state."""
+        self._units = {issi: self._units.get(issi) or _Unit() for issi in issis}
+        if self._units:
+            self._timers.schedule("poll", POLL_TICK, self._tick)
+        else:
+            self._timers.cancel("poll")
+
+    @callback
+    def update(self, key: str, record: Mapping[str, Any]) -> None:
+        """Note a location report of an ISSI."""
+        unit = self._units.get(record["issi_sen"])
+        if unit is None:
+            return
+        unit.last_report = time.monotonic()
+        speed = record.get("ground_speed")
+        if speed is None:
+            speed = record["velocity"]
+        unit.speed = speed if isinstance(speed, (int, float)) else 0.0
+        if unit.requested:
+            unit.requested = 0.0
+            if record["reason_sending"] == REASON_SENDING_IMMEDIATE_REQUEST:
+                self.responses += 1
+
+    @callback
+    def _tick(self) -> None:
+        """Request the location of the most overdue ISSI."""
+        self._timers.schedule("poll", POLL_TICK, self._tick)
+        now = time.monotonic()
+
+        outstanding = 0
+        overdue_issi = None
+        overdue = 0.0
+        for issi, unit in self._units.items():
+            if unit.requested:
+                if now - unit.requested < POLL_RESPONSE_TIMEOUT:
+                    outstanding += 1
+                    continue
+                unit.requested = 0.0
+                self.timeouts += 1
+            late = now - unit.last_report - unit.interval()
+            if late >= 0 and (overdue_issi is None or late > overdue):
+                overdue_issi, overdue = issi, late
+
+        if overdue_issi is None or outstanding >= POLL_MAX_OUTSTANDING:
+            return
+        try:
+            self._transmit.send_location_request(overdue_issi)
+        except ValueError as err:
+            _LOGGER.debug("Location request to %s not queued: %s", overdue_issi, err)
+            return
+        self._units[overdue_issi].requested = now
+        self.requests += 1
+
+    @callback
+    def stop(self) -> None:
+        """Stop polling."""
+        self._timers.cancel("poll")
+
+    def stats(self) -> dict[str, int]:
+        """Return polling counters, e.g. for diagnostics."""
+        return {
+            "fleet": len(self._units),
+            "outstanding": sum(1 for unit in self._units.values() if unit.requested),
+            "requests": self.requests,
+            "responses": self.responses,
+            "timeouts": self.timeouts,
+        }
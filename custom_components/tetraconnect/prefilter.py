@@ -0,0 +1,114 @@
+"""Header-only pre-filter of SDS in tetraconnect integration.
+
+Used by the data handlers within HA and within the worker process, thus it must not
+depend on HA.
+
+"""
+
+from collections.abc import Mapping
+import re
+
+from .const import PREFILTER_OPTIONS
+
+_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def split_list(value: object) -> list[str]:
+    """Return the items of a comma or whitespace separated option value."""
+    if isinstance(value, str):
+        return [item for item in _SEPARATORS.split(value) if item]
+    return [str(item) for item in value or ()]
+
+
+def _sds_type(value: str) -> int:
+    """Return a decimal SDS type, raise ValueError if invalid."""
+    sds_type = int(value)
+    if not 0 <= sds_type <= 0xFF:
+        raise ValueError(f"SDS type {value} out of range")
+    return sds_type
+
+
+class TetraPreFilter:
+    """Allow and deny lists of ISSIs and SDS types, matched on the message header.
+
+    A message is dropped if sending or receiving ISSI is denied, or if an allow list
+    of ISSIs is set and neither of both is allowed. SDS types are decimal and kept in
+    a bitmap of all 256 types, thus matching is a few set and index lookups. Deny
+    lists take precedence over allow lists, empty lists filter nothing.
+
+    """
+
+    def __init__(self, options: Mapping[str, object] | None = None) -> None:
+        """Initialize the pre-filter, options as of PREFILTER_OPTIONS."""
+        self.active = False
+        self._issi_allow: frozenset[str] = frozenset()
+        self._issi_deny: frozenset[str] = frozenset()
+        self._sds_types = bytearray(b"\x01" * 256)
+
+        self.passed = 0
+        self.filtered_issi = 0
+        self.filtered_sds_type = 0
+
+        self.configure(options or {})
+
+    def configure(self, options: Mapping[str, object]) -> None:
+        """Replace the filter rules, counters are kept.
+
+        Raises:
+            ValueError: If an SDS type is not a number from 0 to 255.
+
+        """
+        issi_allow, issi_deny, sds_type_allow, sds_type_deny = (
+            split_list(options.get(key)) for key in PREFILTER_OPTIONS
+        )
+        self._issi_allow = frozenset(issi_allow)
+        self._issi_deny = frozenset(issi_deny)
+
+        sds_types = bytearray(256) if sds_type_allow else bytearray(b"\x01" * 256)
+        for sds_type in sds_type_allow:
+            sds_types[_sds_type(sds_type)] = 1
+        for sds_type in sds_type_deny:
+            sds_types[_sds_type(sds_type)] = 0
+        self._sds_types = sds_types
+
+        self.active = bool(
+            self._issi_allow or self._issi_deny or sds_type_allow or sds_type_deny
+        )
+
+    def accepts(self, header: list[str]) -> bool:
+        """Return whether to decode a +CTSDSR message split into its fields.
+
+        Malformed messages are accepted, they are handled by the user data checks.
+
+        """
+        try:
+            issi_sen = header[2]
+            issi_rec = header[4]
+            sds_type = int(header[7][:2], 16)
+        except (IndexError, ValueError):
+            return True
+
+        if (
+            self._issi_deny
+            and (issi_sen in self._issi_deny or issi_rec in self._issi_deny)
+        ) or (
+            self._issi_allow
+            and issi_sen not in self._issi_allow
+            and issi_rec not in self._issi_allow
+        ):
+            self.filtered_issi += 1
+            return False
+        if not self._sds_types[sds_type]:
+            self.filtered_sds_type += 1
+            return False
+        self.passed += 1
+        return True
+
+    def stats(self) -> dict[str, int | bool]:
+        """Return pre-filter counters, e.g. for diagnostics."""
+        return {
+            "active": self.active,
+            "passed": self.passed,
+            "filtered_issi": self.filtered_issi,
+            "filtered_sds_type": self.filtered_sds_type,
+        }
@@ -0,0 +1,152 @@
+"""Contain the lazy decoded record for TETRA messages in tetraconnect integration."""
+
+from collections.abc import Callable, Iterator, Mapping
+import marshal
+from typing import Any
+
+_NO_DECODERS: Mapping[str, Callable[["TetraRecord"], Any]] = {}
+
+
+class TetraRecord(Mapping):
+    """Compact record of one TETRA message.
+
+    Header fields are set eagerly while tokenizing the message. Fields derived from
+    the payload (coordinates, velocity, descriptions, ...) are decoded on first access
+    only and cached afterwards. Fields never set fall back to the given defaults, thus
+    the record serialises to the same attribute dict as the defaults are shaped.
+
+    """
+
+    __slots__ = (
+        "_defaults",
+        "_values",
+        "_fields",
+        "_decoders",
+        "bits",
+        "payload",
+        "raw",
+        "received",
+        "framed",
+        "decoded",
+        "published",
+    )
+
+    def __init__(
+        self,
+        defaults: Mapping[str, Any],
+        raw: str = "",
+        received: float = 0.0,
+        framed: float = 0.0,
+    ) -> None:
+        """Initialize an empty record based on the given defaults.
+
+        Received is the monotonic time the last byte of the message arrived, framed
+        the time the message was split from the serial data. Decoded and published
+        are set by the coordinator when passing the stages, see TetraLatency.
+
+        """
+        self._defaults = defaults
+        self._values: dict[str, Any] = {}
+        self._fields: dict[str, Any] = {}
+        self._decoders = _NO_DECODERS
+        self.bits: str = ""
+        self.payload: str = ""
+        self.raw = raw
+        self.received = received
+        self.framed = framed
+        self.decoded = 0.0
+        self.published = 0.0
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field, decoding and caching it on first access."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        try:
+            return self._fields[key]
+        except KeyError:
+            pass
+
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            value = self._fields[key] = decoder(self)
+            return value
+
+        return self._defaults[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set a field eagerly."""
+        self._values[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all field names of the defaults."""
+        return iter(self._defaults)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(self._defaults)
+
+    def __repr__(self) -> str:
+        """Return a short representation without decoding any field."""
+        return f"TetraRecord({self._values!r}, payload={self.payload!r})"
+
+    def defer(self, decoders: Mapping[str, Callable[["TetraRecord"], Any]]) -> None:
+        """Register decoders for fields, that will be decoded on first access only.
+
+        Decoders are shared between records, thus pass a prebuilt mapping here instead
+        of creating one per message.
+
+        """
+        self._decoders = decoders
+
+    @property
+    def eager_count(self) -> int:
+        """Return the number of fields set eagerly so far."""
+        return len(self._values)
+
+    def payload_state(self, since: int = 0) -> tuple:
+        """Return the state derived from the payload, to be shared by equal payloads.
+
+        The state holds the fields set eagerly after the first since fields, the bits,
+        the decoders and the cache of decoded fields. The cache is shared, not
+        copied, thus each field is decoded once for all records sharing the state.
+
+        """
+        values = tuple(self._values.items())[since:]
+        return values, self.bits, self._decoders, self._fields
+
+    def apply_payload_state(self, state: tuple) -> None:
+        """Take over the state of a record with the same payload."""
+        values, self.bits, self._decoders, self._fields = state
+        self._values.update(values)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Decode all fields and return them as attribute dict."""
+        return {key: self[key] for key in self._defaults}
+
+    def to_wire(self) -> bytes:
+        """Decode all fields and pack the record into a compact binary form.
+
+        Field names are not packed, values are ordered like the defaults. Decoded
+        fields beyond the defaults (e.g. codes used for prioritizing) are kept.
+
+        """
+        values = tuple(self[key] for key in self._defaults)
+        extra = {
+            key: self[key] for key in self._decoders if key not in self._defaults
+        }
+        return marshal.dumps(
+            (values, extra, self.payload, self.raw, self.received, self.framed)
+        )
+
+    @classmethod
+    def from_wire(cls, defaults: Mapping[str, Any], data: bytes) -> "TetraRecord":
+        """Unpack a record packed by to_wire with the same defaults."""
+        values, extra, payload, raw, received, framed = marshal.loads(data)
+        record = cls(defaults, raw, received, framed)
+        record._values = dict(zip(defaults, values))
+        record._values.update(extra)
+        record.payload = payload
+        return record
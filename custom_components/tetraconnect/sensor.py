@@ -5,37 +5,41 @@ import logging
 from homeassistant.core import HomeAssistant, callback
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.importlib import async_import_module
 
 from collections.abc import Callable
 from typing import Any
 from .const import DOMAIN
 from .entities.base import TetraBaseSensor
-from .entities.cme import CMESensor
-from .entities.connection import ConnectionStatusSensor
-from .entities.ctsdsr import CTSDRSSensor
-from .entities.gmi import GMISensor
-from .entities.gmm import GMMSensor
-from .entities.gmr import GMRSensor
-from .entities.invalid import TetraInvalid
-
-# Mapping from TETRA command to sensor class
+
+# Mapping from TETRA command to sensor class as "<module in entities>.<class>"
+# sensor modules are imported on the first message of their command only
 # add any new command-sensorclass-combo here
 # DO NOT remove or change entries "connection_status" or "default"!
-SENSOR_CLASS_MAP: dict[str, type[TetraBaseSensor]] = {
-    "+CTSDSR": CTSDRSSensor,
-    "+CMEE": CMESensor,
-    "+CME ERROR": CMESensor,
-    "+GMI": GMISensor,
-    "+GMM": GMMSensor,
-    "+GMR": GMRSensor,
-    "connection_status": ConnectionStatusSensor,
-    "default": TetraBaseSensor,  # Fallback for unknown commands
-    "Invalid": TetraInvalid,
+SENSOR_CLASS_MAP: dict[str, str] = {
+    "+CTSDSR": "ctsdsr.CTSDRSSensor",
+    "+CMEE": "cme.CMESensor",
+    "+CME ERROR": "cme.CMESensor",
+    "+GMI": "gmi.GMISensor",
+    "+GMM": "gmm.GMMSensor",
+    "+GMR": "gmr.GMRSensor",
+    "connection_status": "connection.ConnectionStatusSensor",
+    "default": "base.TetraBaseSensor",  # Fallback for unknown commands
+    "Invalid": "invalid.TetraInvalid",
 }
 
 _LOGGER = logging.getLogger(__name__)
 
 
+async def _async_get_sensor_class(
+    hass: HomeAssistant, class_path: str
+) -> type[TetraBaseSensor]:
+    """Import the module of a sensor class on demand and return the class."""
+    module_name, class_name = class_path.rsplit(".", 1)
+    module = await async_import_module(hass, f"{__package__}.entities.{module_name}")
+    return getattr(module, class_name)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -44,6 +48,48 @@ async def async_setup_entry(
     """Set up tetraHAconnect sensors based on a config entry."""
     coordinator = hass.data[DOMAIN]
     entities = {}
+    # latest data of keys, whose sensor class is being imported
+    pending: dict[str, dict[str, Any]] = {}
+    sensor_classes: dict[str, type[TetraBaseSensor]] = {
+        SENSOR_CLASS_MAP["default"]: TetraBaseSensor
+    }
+
+    def class_path_of(key: str, data: dict[str, Any]) -> str:
+        try:
+            # special case: invalid messages
+            if data["validity"] == "invalid":
+                return SENSOR_CLASS_MAP.get("invalid", SENSOR_CLASS_MAP["default"])
+        except (KeyError, TypeError):
+            return SENSOR_CLASS_MAP["default"]
+
+        # Check if the key is in the SENSOR_CLASS_MAP
+        return SENSOR_CLASS_MAP.get(key, SENSOR_CLASS_MAP["default"])
+
+    def create_entity(
+        key: str, data: dict[str, Any], class_path: str
+    ) -> TetraBaseSensor:
+        try:
+            return sensor_classes[class_path](coordinator, key, data)
+        except (KeyError, TypeError, AttributeError):
+            # If the data does not fit, use the default sensor class
+            return TetraBaseSensor(coordinator, key, data)
+
+    def add_entities(new_entities: list[TetraBaseSensor]) -> None:
+        for entity in new_entities:
+            entities[entity.key] = entity
+        async_add_entities(new_entities)
+        coordinator.mark_startup("first_entity")
+
+    async def async_add_entity_after_import(key: str, class_path: str) -> None:
+        try:
+            sensor_classes[class_path] = await _async_get_sensor_class(
+                hass, class_path
+            )
+        except (ImportError, AttributeError) as err:
+            _LOGGER.error("Failed to load sensor class %s: %s", class_path, err)
+            sensor_classes[class_path] = TetraBaseSensor
+
+        add_entities([create_entity(key, pending.pop(key), class_path)])
 
     @callback
     def update_entities():
@@ -52,30 +98,23 @@ async def async_setup_entry(
 
         for key, data in messages.items():
             if key in entities:
+                entities[key].set_stamps(data)
                 entities[key].update_entities(data)
+            elif key in pending:
+                # sensor class still being imported, keep latest data only
+                pending[key] = data
             else:
-                try:
-                    # special case: invalid messages
-                    if data["validity"] == "invalid":
-                        sensor_cls = SENSOR_CLASS_MAP.get("invalid", TetraBaseSensor)
-                        entity = sensor_cls(coordinator, key, data)
-
-                    # Check if the key is in the SENSOR_CLASS_MAP
-                    else:
-                        sensor_cls = SENSOR_CLASS_MAP.get(key, TetraBaseSensor)
-                        entity = sensor_cls(coordinator, key, data)
-
-                except (KeyError, TypeError, AttributeError):
-                    # If the key is not found, use the default sensor class
-                    sensor_cls = SENSOR_CLASS_MAP.get("default", TetraBaseSensor)
-                    entity = sensor_cls(coordinator, key, data)
-
-                # entity = sensor_factory(coordinator, key, data)
-                entities[key] = entity
-                new_entities.append(entity)
+                class_path = class_path_of(key, data)
+                if class_path in sensor_classes:
+                    new_entities.append(create_entity(key, data, class_path))
+                else:
+                    pending[key] = data
+                    config_entry.async_create_task(
+                        hass, async_add_entity_after_import(key, class_path)
+                    )
 
         if new_entities:
-            async_add_entities(new_entities)
+            add_entities(new_entities)
 
     update_entities()
     coordinator.async_add_listener(update_entities)
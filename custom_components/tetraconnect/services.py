@@ -0,0 +1,122 @@
+"""Services of tetraconnect integration."""
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+import voluptuous as vol
+
+from .const import DOMAIN, TX_MAX_TEXT_LENGTH
+
+SERVICE_GET_TRACK = "get_track"
+SERVICE_GET_STATISTICS = "get_statistics"
+SERVICE_SEND_STATUS = "send_status"
+SERVICE_SEND_TEXT = "send_text"
+SERVICE_RELOAD_DIRECTORY = "reload_directory"
+
+ISSI = vol.All(cv.string, vol.Match(r"^\d{1,8}$"))
+
+GET_TRACK_SCHEMA = vol.Schema(
+    {
+        vol.Required("issi"): cv.string,
+        vol.Optional("max_age"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+GET_STATISTICS_SCHEMA = vol.Schema({vol.Optional("issi"): cv.string})
+SEND_STATUS_SCHEMA = vol.Schema(
+    {
+        vol.Required("issi"): ISSI,
+        vol.Required("status"): vol.All(vol.Coerce(int), vol.Range(min=0, max=253)),
+    }
+)
+SEND_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required("issi"): ISSI,
+        vol.Required("text"): vol.All(
+            cv.string, vol.Length(min=1, max=TX_MAX_TEXT_LENGTH)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of tetraconnect."""
+
+    async def async_get_track(call: ServiceCall) -> ServiceResponse:
+        """Return the recent track of an ISSI in one response."""
+        coordinator = hass.data[DOMAIN]
+        issi = call.data["issi"]
+        return {
+            "issi": issi,
+            "points": coordinator.tracks.track(issi, call.data.get("max_age")),
+        }
+
+    async def async_get_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return the statistics of one or all ISSIs."""
+        statistics = hass.data[DOMAIN].statistics
+        issi = call.data.get("issi")
+        if issi is None:
+            return {"issis": statistics.all()}
+        return {"issis": {issi: statistics.issi(issi)}}
+
+    async def async_send_status(call: ServiceCall) -> None:
+        """Queue a status to an ISSI."""
+        try:
+            hass.data[DOMAIN].transmit.send_status(
+                call.data["issi"], call.data["status"]
+            )
+        except ValueError as err:
+            raise HomeAssistantError(f"Status not queued: {err}") from err
+
+    async def async_send_text(call: ServiceCall) -> None:
+        """Queue a text message to an ISSI."""
+        try:
+            hass.data[DOMAIN].transmit.send_text(call.data["issi"], call.data["text"])
+        except ValueError as err:
+            # UnicodeEncodeError is a ValueError as well
+            raise HomeAssistantError(f"Text message not queued: {err}") from err
+
+    async def async_reload_directory(call: ServiceCall) -> None:
+        """Reload the ISSI directory, the radio link stays connected."""
+        if not await hass.data[DOMAIN].directory.async_load():
+            raise HomeAssistantError("ISSI directory not reloaded, see the log")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRACK,
+        async_get_track,
+        schema=GET_TRACK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        async_get_statistics,
+        schema=GET_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_STATUS, async_send_status, schema=SEND_STATUS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_TEXT, async_send_text, schema=SEND_TEXT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RELOAD_DIRECTORY, async_reload_directory
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services of tetraconnect."""
+    hass.services.async_remove(DOMAIN, SERVICE_GET_TRACK)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_STATISTICS)
+    hass.services.async_remove(DOMAIN, SERVICE_SEND_STATUS)
+    hass.services.async_remove(DOMAIN, SERVICE_SEND_TEXT)
+    hass.services.async_remove(DOMAIN, SERVICE_RELOAD_DIRECTORY)
@@ -0,0 +1,135 @@
+"""Warm-start snapshot of the last known state in tetraconnect integration."""
+
+from collections.abc import Callable, Mapping
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_MAX_ISSIS,
+    SNAPSHOT_SAVE_INTERVAL,
+    SNAPSHOT_VERSION,
+)
+from .record import TetraRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TetraSnapshot:
+    """Last known state per command and per ISSI, persisted for warm starts.
+
+    Only the raw messages are stored, thus the snapshot stays compact. On restore the
+    messages are decoded again, which is cheap as records decode their fields lazily.
+    The snapshot is written by HA's storage helper off the event loop, at most every
+    SNAPSHOT_SAVE_INTERVAL seconds and on shutdown.
+
+    Per ISSI the latest record of each SDS type is kept with its arrival time, for up
+    to SNAPSHOT_MAX_ISSIS ISSIs which sent an SDS within SNAPSHOT_MAX_AGE seconds.
+    Restored records get their arrival time back as monotonic time in received.
+
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._save_scheduled = False
+
+        self.commands: dict[str, TetraRecord] = {}
+        # records per ISSI and SDS type, least recently updated ISSI first
+        self.issis: dict[str, dict[int, TetraRecord]] = {}
+
+    @callback
+    def update(self, message: Mapping[str, Mapping[str, Any]]) -> None:
+        """Keep the latest valid record per command and per ISSI and SDS type."""
+        for key, data in message.items():
+            if not isinstance(data, TetraRecord) or data["validity"] != "valid":
+                continue
+
+            self.commands[key] = data
+            issi = data["issi_sen"]
+            if issi:
+                records = self.issis.pop(issi, None) or {}
+                records[data["sds_type"]] = data
+                self.issis[issi] = records
+                self._prune()
+
+            if not self._save_scheduled:
+                self._save_scheduled = True
+                self._store.async_delay_save(self._data, SNAPSHOT_SAVE_INTERVAL)
+
+    def _prune(self) -> None:
+        """Drop the least recently updated ISSIs beyond the maximum number or age."""
+        issis = self.issis
+        oldest = time.monotonic() - SNAPSHOT_MAX_AGE
+        while issis:
+            issi = next(iter(issis))
+            if (
+                len(issis) <= SNAPSHOT_MAX_ISSIS
+                and max(record.received for record in issis[issi].values()) >= oldest
+            ):
+                break
+            del issis[issi]
+
+    def _data(self) -> dict[str, Any]:
+        """Return the snapshot data to store."""
+        self._save_scheduled = False
+        self._prune()
+        offset = time.time() - time.monotonic()  # epoch time of monotonic time 0
+        return {
+            "commands": {key: record.raw for key, record in self.commands.items()},
+            "issis": [
+                [record.raw, round(record.received + offset, 3)]
+                for records in self.issis.values()
+                for record in records.values()
+            ],
+        }
+
+    async def async_restore(self, decode: Callable[[str], TetraRecord]) -> None:
+        """Restore the last known state, decoding raw messages with the given decoder."""
+        started = time.monotonic()
+        data = await self._store.async_load()
+        if not data:
+            return
+
+        offset = time.time() - time.monotonic()
+        try:
+            for item in data["issis"]:
+                if isinstance(item, str):
+                    # stored before arrival times were kept, too old to be of use
+                    continue
+                raw, arrived = item
+                record = decode(raw)
+                record.received = arrived - offset
+                self.issis.setdefault(record["issi_sen"], {})[record["sds_type"]] = (
+                    record
+                )
+            self._prune()
+            for key, raw in data["commands"].items():
+                self.commands[key] = decode(raw)
+        except (KeyError, TypeError, ValueError, AttributeError, IndexError) as err:
+            _LOGGER.warning("Ignoring invalid snapshot: %s", err)
+            self.commands.clear()
+            self.issis.clear()
+            return
+
+        _LOGGER.debug(
+            "Restored %s commands and %s ISSIs from snapshot in %.1f ms",
+            len(self.commands),
+            len(self.issis),
+            (time.monotonic() - started) * 1000,
+        )
+
+    async def async_save(self) -> None:
+        """Save the snapshot immediately."""
+        await self._store.async_save(self._data())
+
+    def stats(self) -> dict[str, int]:
+        """Return snapshot statistics, e.g. for diagnostics."""
+        return {"commands": len(self.commands), "issis": len(self.issis)}
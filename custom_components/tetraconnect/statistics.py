@@ -0,0 +1,130 @@
+"""Rolling statistics per ISSI in tetraconnect integration."""
+
+from array import array
+from collections.abc import Mapping
+import math
+import time
+from typing import Any
+
+from homeassistant.core import callback
+
+from .const import SDS_TYPE_STATUS, STATS_RATE_TIME_CONSTANT, STATS_SDS_TYPES
+
+# index of the type counter for all SDS types not listed in STATS_SDS_TYPES
+_OTHER = len(STATS_SDS_TYPES)
+_TYPE_INDEX = {sds_type: index for index, sds_type in enumerate(STATS_SDS_TYPES)}
+
+
+class TetraStatistics:
+    """Message rate, last seen, SDS type counts and status histogram per ISSI.
+
+    Each ISSI gets a slot in flat arrays on its first message, thus updates are O(1)
+    and need no allocation except for new ISSIs and new status codes. The message
+    rate is an exponentially decayed average with time constant
+    STATS_RATE_TIME_CONSTANT, counts are kept for STATS_SDS_TYPES and all others.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self._slots: dict[str, int] = {}
+        self._last_seen = array("d")  # epoch seconds
+        self._last_monotonic = array("d")
+        self._rate = array("d")  # messages per second
+        self._counts = array("L")  # len(STATS_SDS_TYPES) + 1 counters per slot
+        self._status: list[dict[int, int] | None] = []
+        self.messages = 0
+
+    def _slot(self, issi: str) -> int:
+        """Return the slot of an ISSI, adding it if new."""
+        slot = self._slots.get(issi)
+        if slot is None:
+            slot = self._slots[issi] = len(self._last_seen)
+            self._last_seen.append(0.0)
+            self._last_monotonic.append(0.0)
+            self._rate.append(0.0)
+            self._counts.extend([0] * (_OTHER + 1))
+            self._status.append(None)
+        return slot
+
+    @callback
+    def update(self, record: Mapping[str, Any]) -> None:
+        """Count an SDS of an ISSI."""
+        issi = record["issi_sen"]
+        if not issi:
+            return
+        sds_type = record["sds_type"]
+        status = record["tetra_status"] if sds_type == SDS_TYPE_STATUS else 0
+        self.add(issi, sds_type, status)
+
+    @callback
+    def add(self, issi: str, sds_type: int, status: int, count: int = 1) -> None:
+        """Count SDS of an ISSI of one SDS type and status, now."""
+        now = time.monotonic()
+        slot = self._slot(issi)
+        self.messages += count
+
+        elapsed = now - self._last_monotonic[slot]
+        self._rate[slot] = (
+            self._rate[slot] * math.exp(-elapsed / STATS_RATE_TIME_CONSTANT)
+            + count / STATS_RATE_TIME_CONSTANT
+        )
+        self._last_monotonic[slot] = now
+        self._last_seen[slot] = time.time()
+
+        self._counts[slot * (_OTHER + 1) + _TYPE_INDEX.get(sds_type, _OTHER)] += count
+        if sds_type == SDS_TYPE_STATUS:
+            histogram = self._status[slot]
+            if histogram is None:
+                histogram = self._status[slot] = {}
+            histogram[status] = histogram.get(status, 0) + count
+
+    def restore(self, issi: str, last_seen: float) -> None:
+        """Restore the time (epoch seconds) an ISSI was seen last, e.g. on startup."""
+        slot = self._slot(issi)
+        self._last_seen[slot] = last_seen
+        self._last_monotonic[slot] = time.monotonic() - (time.time() - last_seen)
+
+    def _rate_per_minute(self, slot: int, now: float) -> float:
+        """Return the message rate of a slot decayed to now."""
+        elapsed = now - self._last_monotonic[slot]
+        return self._rate[slot] * math.exp(-elapsed / STATS_RATE_TIME_CONSTANT) * 60
+
+    def issi(self, issi: str) -> dict[str, Any] | None:
+        """Return the statistics of an ISSI, None if it was never seen."""
+        slot = self._slots.get(issi)
+        if slot is None:
+            return None
+
+        now = time.monotonic()
+        counts = self._counts[slot * (_OTHER + 1) : (slot + 1) * (_OTHER + 1)]
+        sds_types = {
+            str(sds_type): counts[index]
+            for index, sds_type in enumerate(STATS_SDS_TYPES)
+            if counts[index]
+        }
+        if counts[_OTHER]:
+            sds_types["other"] = counts[_OTHER]
+
+        return {
+            "last_seen": self._last_seen[slot],
+            "silent_for": round(now - self._last_monotonic[slot], 1),
+            "rate_per_minute": round(self._rate_per_minute(slot, now), 3),
+            "sds_types": sds_types,
+            "status": dict(self._status[slot] or {}),
+        }
+
+    def all(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of all ISSIs."""
+        return {issi: self.issi(issi) for issi in self._slots}
+
+    def stats(self) -> dict[str, Any]:
+        """Return a summary without ISSIs, e.g. for diagnostics."""
+        now = time.monotonic()
+        rates = [self._rate_per_minute(slot, now) for slot in self._slots.values()]
+        return {
+            "issis": len(self._slots),
+            "messages": self.messages,
+            "max_rate_per_minute": round(max(rates), 3) if rates else 0.0,
+            "total_rate_per_minute": round(sum(rates), 3),
+        }
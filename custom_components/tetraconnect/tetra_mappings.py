@@ -119,6 +119,7 @@ class Mappings:
             "+GMR": "Revision Identification",
             "+CMEE": "Error Report",
             "+CME ERROR": "Error Report",
+            "+CMGS": "SDS Sent",
             "+ENCR": "Encryption Status",
         }
         return command_mapping.get(sds_command, "unknown")
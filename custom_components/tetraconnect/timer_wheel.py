@@ -0,0 +1,108 @@
+"""Hashed timer wheel for timeouts in tetraconnect integration."""
+
+import asyncio
+from collections.abc import Callable, Hashable
+import logging
+import math
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import TIMER_WHEEL_SLOTS, TIMER_WHEEL_TICK
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """Many timeouts on a single periodic tick.
+
+    Timers are kept in TIMER_WHEEL_SLOTS slots by their expiry tick, each tick only
+    the timers of one slot are checked. Timers are identified by a key, scheduling
+    a key again replaces its timer, thus rescheduling on every message is O(1) and
+    creates no event loop handles. Timers fire up to one TIMER_WHEEL_TICK late.
+
+    The wheel only ticks while timers are pending.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self._slots: list[dict[Hashable, tuple[int, Callable[[], None]]]] = [
+            {} for _ in range(TIMER_WHEEL_SLOTS)
+        ]
+        self._timers: dict[Hashable, int] = {}
+        self._origin = hass.loop.time()
+        self._processed = 0
+        self._handle: asyncio.TimerHandle | None = None
+
+        self.fired = 0
+
+    def _current_tick(self) -> int:
+        """Return the tick of the current event loop time."""
+        return int((self.hass.loop.time() - self._origin) / TIMER_WHEEL_TICK)
+
+    @callback
+    def schedule(self, key: Hashable, delay: float, action: Callable[[], None]) -> None:
+        """Call action after delay seconds, replacing a pending timer of the key."""
+        if self._handle is None:
+            # nothing pending, skip the ticks passed while idle
+            self._processed = self._current_tick()
+            self._schedule_tick()
+
+        self.cancel(key)
+        expiry = self._current_tick() + max(1, math.ceil(delay / TIMER_WHEEL_TICK))
+        slot = expiry % TIMER_WHEEL_SLOTS
+        self._slots[slot][key] = (expiry, action)
+        self._timers[key] = slot
+
+    @callback
+    def cancel(self, key: Hashable) -> None:
+        """Cancel the timer of a key, if pending."""
+        slot = self._timers.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def _schedule_tick(self) -> None:
+        """Schedule the next tick, aligned to the origin thus ticks do not drift."""
+        self._handle = self.hass.loop.call_at(
+            self._origin + (self._processed + 1) * TIMER_WHEEL_TICK, self._tick
+        )
+
+    @callback
+    def _tick(self) -> None:
+        """Fire all expired timers of the ticks passed since the last tick."""
+        # the loop may call a little early, at least the scheduled tick is due
+        now = max(self._current_tick(), self._processed + 1)
+        while self._processed < now:
+            self._processed += 1
+            bucket = self._slots[self._processed % TIMER_WHEEL_SLOTS]
+            expired = [
+                key for key, (expiry, _) in bucket.items() if expiry <= self._processed
+            ]
+            for key in expired:
+                _, action = bucket.pop(key)
+                del self._timers[key]
+                self.fired += 1
+                try:
+                    action()
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in timer %s", key)
+
+        if self._timers:
+            self._schedule_tick()
+        else:
+            self._handle = None
+
+    @callback
+    def stop(self) -> None:
+        """Cancel all timers."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for bucket in self._slots:
+            bucket.clear()
+        self._timers.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return timer statistics, e.g. for diagnostics."""
+        return {"pending": len(self._timers), "fired": self.fired}
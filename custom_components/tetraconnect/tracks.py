@@ -0,0 +1,197 @@
+"""Tracks of ISSIs built from location reports in tetraconnect integration."""
+
+from collections import deque
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    TRACK_MAX_AGE,
+    TRACK_MAX_POINTS,
+    TRACK_MAX_SPEED,
+    TRACK_MIN_ANGLE,
+    TRACK_MIN_DISTANCE,
+    TRACK_MIN_GAP,
+)
+from .geofence import haversine
+from .record import TetraRecord
+
+# point of a track: time of the fix (epoch seconds), lat, lng
+Point = tuple[float, float, float]
+
+# lower bound in seconds of the LIP time elapsed since the fix, by its description
+_TIME_ELAPSED = {"<5s": 0.0, "<5min": 5.0, "<30min": 300.0}
+
+
+def bearing(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the initial bearing in degrees from the first to the second point."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dlng = math.radians(lng2 - lng1)
+    x = math.sin(dlng) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(
+        dlng
+    )
+    return math.degrees(math.atan2(x, y)) % 360
+
+
+def fix_time(record: TetraRecord) -> float:
+    """Return the time (epoch seconds) a location report was fixed.
+
+    The time is taken from the arrival of the message minus the time elapsed
+    reported with it, thus delays in processing do not distort speeds.
+
+    """
+    now = time.time()
+    received = getattr(record, "received", 0.0)
+    if received:
+        now -= time.monotonic() - received
+    return now - _TIME_ELAPSED.get(record["time_elapsed"], 0.0)
+
+
+def _turn(heading1: float, heading2: float) -> float:
+    """Return the absolute change in degrees between two headings."""
+    return abs((heading2 - heading1 + 180) % 360 - 180)
+
+
+class _Track:
+    """Simplified track and kinematics of one ISSI."""
+
+    __slots__ = ("points", "last", "heading", "speed")
+
+    def __init__(self) -> None:
+        """Initialize an empty track."""
+        self.points: deque[Point] = deque(maxlen=TRACK_MAX_POINTS)
+        self.last: Point | None = None
+        self.heading: float | None = None
+        self.speed: float | None = None
+
+
+class TetraTracks:
+    """Bounded tracks per ISSI with ground speed, heading and distance from home.
+
+    Tracks are simplified online: fixes closer than TRACK_MIN_DISTANCE to the last
+    kept point are dropped, except for the last fix of a stop. A fix continuing the
+    last segment within TRACK_MIN_ANGLE replaces its end point. Thus straight drives
+    and stops take one or two points only. Tracks keep at most TRACK_MAX_POINTS points of the last
+    TRACK_MAX_AGE seconds.
+
+    Ground speed and heading are computed from successive fixes, supplementing the
+    coarse velocity and direction reported by the radio. Fixes are timed by
+    fix_time. Fixes less than TRACK_MIN_GAP seconds after the last one (e.g. several
+    reports in one burst) are not added, speeds above TRACK_MAX_SPEED are ignored.
+
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracks."""
+        self.hass = hass
+        self._tracks: dict[Any, _Track] = {}
+
+    @callback
+    def update(self, record: TetraRecord) -> None:
+        """Add a location report to the track of its ISSI.
+
+        Ground speed, heading and distance from home in meters are set on the record.
+
+        """
+        lat = record["lat"]
+        lng = record["lng"]
+        if lat is None or lng is None:
+            return
+
+        fixed = fix_time(record)
+        issi = record["issi_sen"]
+        track = self._tracks.get(issi)
+        if track is None:
+            track = self._tracks[issi] = _Track()
+        point = (fixed, lat, lng)
+
+        last = track.last
+        if last is None or fixed - last[0] >= TRACK_MIN_GAP:
+            if last is not None:
+                distance = haversine(last[1], last[2], lat, lng)
+                if distance >= TRACK_MIN_DISTANCE:
+                    track.heading = bearing(last[1], last[2], lat, lng)
+                speed = distance / (fixed - last[0]) * 3.6
+                if speed <= TRACK_MAX_SPEED:
+                    track.speed = speed
+            self._simplify(track, point)
+            track.last = point
+
+        record["ground_speed"] = (
+            round(track.speed, 1) if track.speed is not None else None
+        )
+        record["heading"] = round(track.heading) if track.heading is not None else None
+        record["distance_home"] = round(
+            haversine(self.hass.config.latitude, self.hass.config.longitude, lat, lng)
+        )
+
+    @staticmethod
+    def _simplify(track: _Track, point: Point) -> None:
+        """Append a point to the track, dropping or merging redundant points."""
+        points = track.points
+        while points and points[0][0] < point[0] - TRACK_MAX_AGE:
+            points.popleft()
+
+        if points:
+            last = points[-1]
+            if haversine(last[1], last[2], point[1], point[2]) < TRACK_MIN_DISTANCE:
+                return
+            stop = track.last
+            if stop is not None and stop[0] > last[0]:
+                # leaving a stop, keep its end thus segment speeds stay correct
+                points.append(stop)
+                points.append(point)
+                return
+            if len(points) > 1:
+                previous = points[-2]
+                turn = _turn(
+                    bearing(previous[1], previous[2], last[1], last[2]),
+                    bearing(last[1], last[2], point[1], point[2]),
+                )
+                if turn < TRACK_MIN_ANGLE:
+                    points[-1] = point
+                    return
+        points.append(point)
+
+    def track(self, issi: str, max_age: float | None = None) -> list[dict[str, Any]]:
+        """Return the track of an ISSI with speed and heading of each segment."""
+        track = self._tracks.get(issi)
+        if track is None:
+            return []
+
+        since = time.time() - max_age if max_age else 0.0
+        points = [point for point in track.points if point[0] >= since]
+        result = []
+        previous = None
+        for point in points:
+            speed = heading = None
+            if previous is not None:
+                distance = haversine(previous[1], previous[2], point[1], point[2])
+                if distance >= TRACK_MIN_DISTANCE:
+                    heading = round(
+                        bearing(previous[1], previous[2], point[1], point[2])
+                    )
+                if point[0] > previous[0]:
+                    speed = round(distance / (point[0] - previous[0]) * 3.6, 1)
+            result.append(
+                {
+                    "time": point[0],
+                    "lat": point[1],
+                    "lng": point[2],
+                    "speed": speed,
+                    "heading": heading,
+                }
+            )
+            previous = point
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """Return track statistics, e.g. for diagnostics."""
+        return {
+            "issis": len(self._tracks),
+            "points": sum(len(track.points) for track in self._tracks.values()),
+        }
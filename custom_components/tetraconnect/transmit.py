@@ -0,0 +1,246 @@
+"""Rate limited transmission of SDS in tetraconnect integration."""
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    AI_SERVICE_SDS_TYPE_4,
+    AI_SERVICE_STATUS,
+    DOMAIN,
+    LIP_IMMEDIATE_LOCATION_REQUEST,
+    SDS_TYPE_SHORT_LOCATION,
+    SDS_PROTOCOL_TEXT,
+    TX_MAX_RETRIES,
+    TX_MIN_INTERVAL,
+    TX_QUEUE_SIZE,
+    TX_RESPONSE_TIMEOUT,
+    TX_RETRY_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_TEXT_CODING_LATIN_1 = 0x01  # Text coding scheme ISO/IEC 8859-1, no timestamp
+
+
+class _Transmission:
+    """Pending SDS to one ISSI."""
+
+    __slots__ = ("issi", "ai_service", "payload", "queued", "attempts")
+
+    def __init__(self, issi: str, ai_service: int, payload: str) -> None:
+        """Initialize the transmission, payload is the user data in hex."""
+        self.issi = issi
+        self.ai_service = ai_service
+        self.payload = payload
+        self.queued = time.monotonic()
+        self.attempts = 0
+
+    def commands(self) -> tuple[str, str]:
+        """Return the AT commands selecting the service and sending the SDS."""
+        return (
+            f"AT+CTSDS={self.ai_service},0\r\n",
+            f"AT+CMGS={self.issi},{len(self.payload) * 4}\r{self.payload}\x1a",
+        )
+
+
+class TetraTransmitQueue:
+    """Queue of SDS to send via the PEI, one at a time.
+
+    Each SDS is sent with AT+CTSDS and, once the radio accepted it, AT+CMGS. It is
+    done, when the radio confirms AT+CMGS with OK. Commands are sent by
+    TetraCommands, thus receiving goes on while waiting for their result. SDS are
+    sent at most every TX_MIN_INTERVAL seconds to respect the air interface. Failed
+    SDS (ERROR, +CME ERROR or no result within TX_RESPONSE_TIMEOUT seconds) are
+    queued again after TX_RETRY_DELAY seconds, up to TX_MAX_RETRIES times. An SDS
+    whose AT+CTSDS failed was not sent at all, thus it is not sent twice.
+
+    Pending SDS are merged: a status replaces a pending status to the same ISSI,
+    the same text to the same ISSI is sent once.
+
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        command: Callable[[str, float], Awaitable[str | None]],
+        timers,
+    ) -> None:
+        """Initialize the queue, command sends an AT command and returns its result."""
+        self.hass = hass
+        self._command = command
+        self._timers = timers
+        self._pending: dict[Hashable, _Transmission] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._sent_times: deque[float] = deque()
+
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.merged = 0
+        self.last_delay = 0.0
+        self.max_delay = 0.0
+        self.total_delay = 0.0
+
+    @callback
+    def async_start(self) -> None:
+        """Start transmitting."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} transmit queue"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop transmitting, pending SDS are dropped."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+
+    @callback
+    def send_status(self, issi: str, status: int) -> None:
+        """Queue a status, encoded like the status messages received."""
+        self._queue(
+            (issi, AI_SERVICE_STATUS),
+            _Transmission(issi, AI_SERVICE_STATUS, f"80{status + 2:02X}"),
+        )
+
+    @callback
+    def send_text(self, issi: str, text: str) -> None:
+        """Queue a text message, sent as SDS-TL text message in Latin-1.
+
+        Raises:
+            UnicodeEncodeError: If the text contains characters beyond Latin-1.
+
+        """
+        payload = "%02X%02X%02X%02X%s" % (
+            SDS_PROTOCOL_TEXT,
+            0x00,  # SDS-TRANSFER without delivery report
+            0x00,  # message reference
+            _TEXT_CODING_LATIN_1,
+            text.encode("latin-1").hex().upper(),
+        )
+        self._queue(
+            (issi, AI_SERVICE_SDS_TYPE_4, payload),
+            _Transmission(issi, AI_SERVICE_SDS_TYPE_4, payload),
+        )
+
+    @callback
+    def send_location_request(self, issi: str) -> None:
+        """Queue an immediate location report request (location information protocol)."""
+        payload = f"{SDS_TYPE_SHORT_LOCATION:02X}{LIP_IMMEDIATE_LOCATION_REQUEST}"
+        self._queue(
+            (issi, AI_SERVICE_SDS_TYPE_4, payload),
+            _Transmission(issi, AI_SERVICE_SDS_TYPE_4, payload),
+        )
+
+    def _queue(self, key: Hashable, transmission: _Transmission) -> None:
+        """Queue a transmission, merging it with a pending one of the same key.
+
+        Raises:
+            ValueError: If TX_QUEUE_SIZE SDS are pending already.
+
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            # latest payload wins, queue position and time of the first are kept
+            pending.payload = transmission.payload
+            self.merged += 1
+            return
+        if len(self._pending) >= TX_QUEUE_SIZE:
+            raise ValueError(f"{TX_QUEUE_SIZE} SDS pending already")
+        self._pending[key] = transmission
+        self._wakeup.set()
+
+    @callback
+    def _requeue(self, key: Hashable, transmission: _Transmission) -> None:
+        """Queue a failed transmission again, unless a newer one is pending."""
+        if key not in self._pending:
+            self._pending[key] = transmission
+            self._wakeup.set()
+
+    async def _async_run(self) -> None:
+        """Send the pending SDS one by one."""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            key = next(iter(self._pending))
+            transmission = self._pending.pop(key)
+            if await self._async_transmit(transmission):
+                self._sent(transmission)
+            elif transmission.attempts <= TX_MAX_RETRIES:
+                self.retries += 1
+                self._timers.schedule(
+                    ("transmit", key),
+                    TX_RETRY_DELAY,
+                    partial(self._requeue, key, transmission),
+                )
+            else:
+                self.failed += 1
+                _LOGGER.error(
+                    "Sending SDS to %s failed after %s attempts",
+                    transmission.issi,
+                    transmission.attempts,
+                )
+            await asyncio.sleep(TX_MIN_INTERVAL)
+
+    async def _async_transmit(self, transmission: _Transmission) -> bool:
+        """Send an SDS and return whether the radio confirmed it."""
+        transmission.attempts += 1
+        for command in transmission.commands():
+            result = await self._command(command, TX_RESPONSE_TIMEOUT)
+            if result is None:
+                self.timeouts += 1
+                return False
+            if result != "OK":
+                _LOGGER.warning(
+                    "Sending SDS to %s failed with %s", transmission.issi, result
+                )
+                return False
+        return True
+
+    def _sent(self, transmission: _Transmission) -> None:
+        """Count a confirmed SDS."""
+        now = time.monotonic()
+        self.sent += 1
+        self._sent_times.append(now)
+        self._trim_sent_times(now)
+        delay = now - transmission.queued
+        self.last_delay = delay
+        self.total_delay += delay
+        if delay > self.max_delay:
+            self.max_delay = delay
+        _LOGGER.debug("Sent SDS to %s after %.1f s", transmission.issi, delay)
+
+    def _trim_sent_times(self, now: float) -> None:
+        """Drop send times older than a minute."""
+        while self._sent_times and self._sent_times[0] < now - 60:
+            self._sent_times.popleft()
+
+    def stats(self) -> dict[str, Any]:
+        """Return transmit counters and queueing delay, e.g. for diagnostics."""
+        self._trim_sent_times(time.monotonic())
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "sent_last_minute": len(self._sent_times),
+            "failed": self.failed,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "merged": self.merged,
+            "queue_delay_s": {
+                "last": round(self.last_delay, 2),
+                "mean": round(self.total_delay / self.sent, 2) if self.sent else 0.0,
+                "max": round(self.max_delay, 2),
+            },
+        }
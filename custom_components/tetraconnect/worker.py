@@ -0,0 +1,318 @@
+"""Out-of-process serial reading and decoding for tetraconnect integration.
+
+Serial reading and decoding run in a separate worker process, thus parsing bursts
+never stall the HA event loop and a crash in the decoder only restarts the worker.
+Decoded records are sent back to HA over a pipe in the compact binary form of
+TetraRecord.to_wire.
+
+Pipe messages start with one byte for the kind of message:
+- worker to HA: R record, C connection status, L log, A raw data to archive,
+  S decoder statistics every WORKER_STATS_INTERVAL seconds
+- HA to worker: F configure the pre-filter, W write data to the radio, Q quit
+
+AT commands like the service profiles are written with W, their results are decoded
+and sent back as records like any other message.
+
+"""
+
+import asyncio
+import contextlib
+import logging
+import marshal
+import multiprocessing
+from multiprocessing.connection import Connection
+import struct
+import time
+
+from .com_manager import COMManager
+from .const import (
+    MAX_RETRY_ATTEMPTS,
+    SLEEP_TIME_CONNECTION_CHECK,
+    WORKER_READ_TIMEOUT,
+    WORKER_START_TIMEOUT,
+    WORKER_STATS_INTERVAL,
+)
+from .decoders import DecoderSink, async_get_decoder_class, get_decoder_class
+from .record import TetraRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_TIME = struct.Struct(">d")
+
+
+class COMWorkerManager(COMManager):
+    """Manages the worker process behind the COMManager interface."""
+
+    def __init__(self, coordinator, com_port: str, baudrate: int) -> None:
+        """Initialize the COMWorkerManager."""
+        super().__init__(coordinator, com_port, baudrate)
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._defaults: dict | None = None
+        self._stats: dict[str, dict] = {}  # latest decoder statistics of the worker
+        self._connected = asyncio.Event()
+        self._attempts = 0  # worker starts since the radio was connected last
+        self.restarts = 0
+
+    async def serial_initialize(self, hass):
+        """Start the worker process and its watchdog."""
+        decoder_cls = await async_get_decoder_class(hass, self.coordinator.manufacturer)
+        self._defaults = decoder_cls.VARIABLES_DEFAULTS
+        self._connection_check_task = hass.loop.create_task(
+            self._periodic_worker_check()
+        )
+
+    async def serial_stop(self):
+        """Stop the worker process and its watchdog."""
+        if self._connection_check_task:
+            self._connection_check_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._connection_check_task
+        await self._stop_worker()
+
+    async def _periodic_worker_check(self):
+        """Continuously ensure a running worker process, restart it if it died.
+
+        The worker is checked every SLEEP_TIME_CONNECTION_CHECK seconds. Restarts
+        without the worker connecting to the radio are limited to MAX_RETRY_ATTEMPTS,
+        unlimited if 0, like reconnects of the in-process connection.
+
+        """
+        while True:
+            if self._process is None or not self._process.is_alive():
+                stopped = self._process is not None
+                if stopped:
+                    _LOGGER.warning(
+                        "Worker process stopped with exit code %s",
+                        self._process.exitcode,
+                    )
+                await self._stop_worker()
+                if MAX_RETRY_ATTEMPTS and self._attempts >= MAX_RETRY_ATTEMPTS:
+                    self.helpers.update_connection_status(3)
+                    _LOGGER.error(
+                        "Abort restarting the worker after %s attempts, please check"
+                        " the connection",
+                        self._attempts,
+                    )
+                    break
+                self.restarts += stopped
+                self._attempts += 1
+                self.helpers.update_connection_status(2)
+                await self._start_worker()
+            await asyncio.sleep(SLEEP_TIME_CONNECTION_CHECK)
+
+    async def _start_worker(self):
+        """Start the worker process and listen to its pipe."""
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=worker_main,
+            args=(
+                child_conn,
+                self.com_port,
+                self.baudrate,
+                self.coordinator.manufacturer,
+                self.coordinator.archive_enabled,
+                self.coordinator.prefilter_options,
+            ),
+            name=f"tetraconnect {self.com_port}",
+            daemon=True,
+        )
+        await self.coordinator.hass.async_add_executor_job(self._process.start)
+        child_conn.close()
+
+        self._conn = parent_conn
+        asyncio.get_running_loop().add_reader(parent_conn.fileno(), self._read_pipe)
+        _LOGGER.info("Worker process started for %s", self.com_port)
+
+    async def _stop_worker(self):
+        """Stop the worker process, kill it if it does not quit in time."""
+        self._connected.clear()
+        if self._conn is not None:
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+            with contextlib.suppress(OSError):
+                self._conn.send_bytes(b"Q")
+            self._conn.close()
+            self._conn = None
+
+        if self._process is not None:
+            process = self._process
+            self._process = None
+            await self.coordinator.hass.async_add_executor_job(
+                process.join, SLEEP_TIME_CONNECTION_CHECK
+            )
+            if process.is_alive():
+                process.kill()
+
+    def _read_pipe(self):
+        """Handle all pending messages of the worker process."""
+        try:
+            while self._conn is not None and self._conn.poll():
+                self._handle_worker_message(self._conn.recv_bytes())
+        except (EOFError, OSError):
+            # worker died, the watchdog will restart it
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+            self._connected.clear()
+            self.helpers.update_connection_status(3)
+
+    def _handle_worker_message(self, message: bytes):
+        """Handle one message of the worker process."""
+        kind, content = message[:1], message[1:]
+
+        if kind == b"R":
+            key, wire = content.split(b"\0", 1)
+            record = TetraRecord.from_wire(self._defaults, wire)
+            self.helpers.fire_fast_path_event(record)
+            self.coordinator.broker.put(key.decode("utf-8"), record)
+
+        elif kind == b"C":
+            status = int(content)
+            if status == 1:
+                self._attempts = 0
+                self._connected.set()
+                _LOGGER.info("Serial connection established on %s", self.com_port)
+            else:
+                self._connected.clear()
+            self.helpers.update_connection_status(status)
+
+        elif kind == b"A":
+            (received,) = ARCHIVE_TIME.unpack_from(content)
+            self.coordinator.archive.append(content[ARCHIVE_TIME.size :], received)
+
+        elif kind == b"S":
+            self._stats = marshal.loads(content)
+
+        elif kind == b"L":
+            _LOGGER.log(int(content[:2]), "Worker: %s", content[2:].decode("utf-8"))
+
+    def write(self, data: bytes) -> bool:
+        """Have the worker write data to the radio, return False if not connected."""
+        if self._conn is None or not self._connected.is_set():
+            return False
+        try:
+            self._conn.send_bytes(b"W" + data)
+        except OSError:
+            return False
+        return True
+
+    def set_prefilter(self, options: dict[str, str]) -> None:
+        """Send changed pre-filter options to the worker."""
+        if self._conn is not None:
+            with contextlib.suppress(OSError):
+                self._conn.send_bytes(b"F" + marshal.dumps(options))
+
+    def prefilter_stats(self) -> dict[str, int | bool] | None:
+        """Return the latest pre-filter counters sent by the worker."""
+        return self._stats.get("prefilter")
+
+    def cache_stats(self) -> dict[str, float] | None:
+        """Return the latest payload cache statistics sent by the worker."""
+        return self._stats.get("cache")
+
+    async def _async_wait_connected(self) -> bool:
+        """Wait for the worker to connect, return whether it is connected."""
+        try:
+            await asyncio.wait_for(self._connected.wait(), WORKER_START_TIMEOUT)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class _WorkerSink(DecoderSink):
+    """Stand-in for coordinator and broker within the worker process.
+
+    Decoded records are sent to HA instead of being dispatched, events are fired by
+    HA when receiving the record.
+
+    """
+
+    def __init__(self, conn: Connection, manufacturer: str) -> None:
+        """Initialize the sink."""
+        super().__init__(manufacturer)
+        self.conn = conn
+
+    def put(self, key: str, message: TetraRecord) -> None:
+        """Decode the record completely and send it to HA."""
+        self.conn.send_bytes(b"R" + key.encode("utf-8") + b"\0" + message.to_wire())
+
+    def connection_status(self, status: int) -> None:
+        """Send the connection status to HA."""
+        self.conn.send_bytes(b"C%d" % status)
+
+    def log(self, level: int, message: str) -> None:
+        """Send a log message to HA."""
+        self.conn.send_bytes(b"L%02d" % level + message.encode("utf-8"))
+
+    def stats(self, decoder) -> None:
+        """Send the statistics of the decoder to HA."""
+        stats = {"prefilter": decoder.prefilter.stats(), "cache": decoder.cache_stats()}
+        self.conn.send_bytes(b"S" + marshal.dumps(stats))
+
+
+def worker_main(
+    conn: Connection,
+    com_port: str,
+    baudrate: int,
+    manufacturer: str,
+    archive: bool = False,
+    prefilter: dict[str, str] | None = None,
+):
+    """Read and decode serial data, entry point of the worker process.
+
+    If archive is set, all received data is sent to HA for archiving. Prefilter are
+    the options of the SDS pre-filter.
+
+    """
+    import serial  # pylint: disable=import-outside-toplevel
+
+    sink = _WorkerSink(conn, manufacturer)
+
+    try:
+        decoder = get_decoder_class(manufacturer)(sink)
+        decoder.prefilter.configure(prefilter or {})
+        port = serial.Serial(com_port, baudrate, timeout=WORKER_READ_TIMEOUT)
+    except (serial.SerialException, OSError, ValueError) as err:
+        sink.log(logging.WARNING, f"Connection to {com_port} failed: {err}")
+        sink.connection_status(3)
+        return
+
+    sink.connection_status(1)
+    raw_data = b""
+    stats_sent = 0.0
+
+    with port:
+        while True:
+            if time.monotonic() - stats_sent >= WORKER_STATS_INTERVAL:
+                sink.stats(decoder)
+                stats_sent = time.monotonic()
+
+            while conn.poll():
+                command = conn.recv_bytes()
+                if command == b"Q":
+                    return
+                if command[:1] == b"F":
+                    decoder.prefilter.configure(marshal.loads(command[1:]))
+                if command[:1] == b"W":
+                    try:
+                        port.write(command[1:])
+                    except serial.SerialException as err:
+                        sink.log(logging.WARNING, f"Error writing to radio: {err}")
+
+            try:
+                data = port.read(port.in_waiting or 1)
+            except serial.SerialException as err:
+                sink.log(logging.WARNING, f"Serial connection lost: {err}")
+                sink.connection_status(3)
+                return
+
+            if not data:
+                continue
+
+            received = time.monotonic()
+            if archive:
+                conn.send_bytes(b"A" + ARCHIVE_TIME.pack(time.time()) + data)
+            raw_data += data
+            try:
+                raw_data = decoder.data_handler(raw_data, received)
+            except (ValueError, TypeError) as err:
+                sink.log(logging.ERROR, f"Error processing incoming data: {err}")
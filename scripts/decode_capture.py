@@ -0,0 +1,28 @@
+"""Offline decoder for captured PEI traffic, runs without Home Assistant.
+
+The package of the integration imports HA, thus its modules are loaded directly
+from their directory as package of their own, see
+custom_components/tetraconnect/capture.py for the usage.
+
+"""
+
+import importlib
+from pathlib import Path
+import sys
+import types
+
+PACKAGE_DIR = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "tetraconnect"
+)
+
+
+def load_capture() -> types.ModuleType:
+    """Return the capture module, loaded without the package __init__."""
+    package = types.ModuleType("tetraconnect")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["tetraconnect"] = package
+    return importlib.import_module("tetraconnect.capture")
+
+
+if __name__ == "__main__":
+    load_capture().main()
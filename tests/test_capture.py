@@ -0,0 +1,41 @@
+"""Tests of the offline decoder of tetraconnect integration."""
+
+import csv
+from pathlib import Path
+import subprocess
+import sys
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "decode_capture.py"
+
+# runs the script with HA made unimportable, even if it is installed
+WITHOUT_HA = (
+    "import runpy, sys; sys.modules['homeassistant'] = None; "
+    "sys.argv = sys.argv[1:]; runpy.run_path(sys.argv[0], run_name='__main__')"
+)
+
+
+def test_decode_raw_capture_without_ha(tmp_path: Path) -> None:
+    """A raw capture is decoded into CSV rows without HA."""
+    capture = tmp_path / "capture.raw"
+    capture.write_bytes(
+        b"\r\n+CTSDSR: 13,1234567,0,7654321,0,16\r\n800A\r\n"
+        b"\r\n+CTSDSR: 12,2345678,0,7654321,0,96\r\n"
+        b"0A0B2F0A7C3A5B1E00A02000\r\n"
+    )
+    output = tmp_path / "sds.csv"
+
+    command = [sys.executable, "-c", WITHOUT_HA, str(SCRIPT), str(capture)]
+    subprocess.run(
+        [*command, "-o", str(output)],
+        check=True,
+        capture_output=True,
+    )
+
+    with output.open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["issi"], row["sds_type"]) for row in rows] == [
+        ("1234567", "128"),
+        ("2345678", "10"),
+    ]
+    assert rows[0]["status"] == "8"
+    assert rows[1]["lat"] and rows[1]["lng"]
@@ -0,0 +1,98 @@
+"""Tests of the state writes of tetraconnect sensors."""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect.const import MIN_STATE_WRITE_INTERVAL
+from custom_components.tetraconnect.entities import base
+from custom_components.tetraconnect.entities.ctsdsr import CTSDRSSensor
+
+
+class _Clock:
+    """Monotonic clock and call_later stand-in, advanced by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.calls: list = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def call_later(self, hass, delay, action):
+        call = [self.now + delay, action]
+        self.calls.append(call)
+        return lambda: self.calls.remove(call)
+
+    def advance(self, seconds: float) -> None:
+        """Advance the clock, run the calls due meanwhile."""
+        self.now += seconds
+        for call in sorted(self.calls, key=lambda call: call[0]):
+            if call[0] <= self.now:
+                self.calls.remove(call)
+                call[1](None)
+
+
+def _sds(issi: int, status: int) -> dict:
+    return {
+        "sds_command": "+CTSDSR",
+        "sds_type": 128,
+        "sds_type_desc": "Status",
+        "issi_sen": issi,
+        "tetra_status": status,
+    }
+
+
+@pytest.fixture(name="sensor")
+def sensor_fixture(monkeypatch):
+    """Return an added +CTSDSR sensor and the list of its written states."""
+    clock = _Clock()
+    monkeypatch.setattr(base, "time", clock)
+    monkeypatch.setattr(base, "async_call_later", clock.call_later)
+
+    coordinator = SimpleNamespace(
+        config_entry=SimpleNamespace(data={}),
+        latency=SimpleNamespace(add=lambda stage, value: None),
+    )
+    sensor = CTSDRSSensor(coordinator, "+CTSDSR", _sds(1, 0))
+    sensor.hass = object()
+    written: list[tuple] = []
+    sensor.async_write_ha_state = lambda: written.append(
+        (clock.now, dict(sensor.extra_state_attributes))
+    )
+    return sensor, clock, written
+
+
+def test_burst_of_one_issi_is_rate_limited(sensor) -> None:
+    """A burst of one ISSI writes its first and latest SDS, one per interval."""
+    sensor, clock, written = sensor
+    for status in range(1, 21):
+        sensor.update_entities(_sds(1, status))
+        clock.advance(0.1)
+    clock.advance(MIN_STATE_WRITE_INTERVAL)
+
+    times = [time for time, _ in written]
+    assert all(
+        later - earlier >= MIN_STATE_WRITE_INTERVAL
+        for earlier, later in zip(times, times[1:])
+    )
+    assert len(written) <= 3
+    assert written[-1][1]["tetra_status"] == 20
+
+
+def test_sds_of_other_issis_are_kept(sensor) -> None:
+    """SDS of other ISSIs within the interval are written, none is replaced."""
+    sensor, clock, written = sensor
+    sensor.update_entities(_sds(1, 1))
+    sensor.update_entities(_sds(1, 2))
+    sensor.update_entities(_sds(2, 3))
+    sensor.update_entities(_sds(3, 4))
+    clock.advance(MIN_STATE_WRITE_INTERVAL)
+
+    assert sorted(
+        (attributes["issi_sen"], attributes["tetra_status"])
+        for _, attributes in written
+    ) == [(1, 1), (1, 2), (2, 3), (3, 4)]
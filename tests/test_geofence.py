@@ -0,0 +1,40 @@
+"""Tests of the geofence index of tetraconnect integration."""
+
+import random
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect.geofence import (
+    Geofence,
+    TetraGeofences,
+    haversine,
+)
+
+
+def test_large_fences_match_linear_scan() -> None:
+    """Fences of all sizes, up to spanning poles and the antimeridian, are found."""
+    rng = random.Random(37)
+    fences = [
+        Geofence(
+            f"fence {index}",
+            rng.uniform(-85, 85),
+            rng.uniform(-180, 180),
+            rng.choice((50, 1000, 50000, 1e6, 5e6, 2e7)),
+        )
+        for index in range(1000)
+    ]
+    geofences = TetraGeofences(None)
+    geofences.index(fences)
+    assert geofences.stats()["levels"] > 1
+
+    for _ in range(1000):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        expected = {
+            index
+            for index, fence in enumerate(fences)
+            if haversine(lat, lng, fence.lat, fence.lng) <= fence.radius
+        }
+        assert geofences.inside(lat, lng) == expected
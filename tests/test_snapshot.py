@@ -0,0 +1,69 @@
+"""Tests of the warm-start snapshot of tetraconnect integration."""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect import snapshot
+from custom_components.tetraconnect.const import SNAPSHOT_MAX_AGE
+from custom_components.tetraconnect.decoders import DecoderSink
+from custom_components.tetraconnect.motorola import Motorola
+
+
+class _Store:
+    """Storage helper stand-in keeping the data in memory."""
+
+    data = None
+
+    def __init__(self, hass, version, key) -> None:
+        """Nothing to initialize."""
+
+    def async_delay_save(self, data_func, delay) -> None:
+        """Saving is triggered by the test."""
+
+    async def async_load(self):
+        return _Store.data
+
+
+class _Sink(DecoderSink):
+    """Collect decoded records."""
+
+    def __init__(self) -> None:
+        super().__init__("Motorola")
+        self.records: list = []
+
+    def put(self, key, message) -> None:
+        self.records.append(message)
+
+
+def _status(issi: int, received: float):
+    """Return the decoded record of a status SDS of an ISSI."""
+    sink = _Sink()
+    Motorola(sink).data_handler(
+        b"\r\n+CTSDSR: 13,%d,0,7654321,0,16\r\n800A\r\n" % issi, received
+    )
+    return sink.records[0]
+
+
+def test_issis_are_restored_with_arrival_time_and_aged_out(monkeypatch) -> None:
+    """ISSIs come back with their arrival time, ISSIs silent for too long do not."""
+    monkeypatch.setattr(snapshot, "Store", _Store)
+    now = time.monotonic()
+    saved = snapshot.TetraSnapshot(None, "entry")
+    saved.update({"+CTSDSR": _status(1111111, now - SNAPSHOT_MAX_AGE - 60)})
+    saved.update({"+CTSDSR": _status(2222222, now - 60)})
+    assert list(saved.issis) == ["2222222"]
+
+    _Store.data = saved._data()  # pylint: disable=protected-access
+    restored = snapshot.TetraSnapshot(None, "entry")
+    decoder = Motorola(_Sink())
+    asyncio.run(restored.async_restore(decoder.decode_message))
+
+    assert list(restored.issis) == ["2222222"]
+    record = restored.issis["2222222"][128]
+    assert record["tetra_status"] == saved.issis["2222222"][128]["tetra_status"]
+    assert record.received == pytest.approx(now - 60, abs=0.1)
@@ -0,0 +1,116 @@
+"""Tests of the SDS transmit queue of tetraconnect integration."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable=wrong-import-position
+from custom_components.tetraconnect.commands import TetraCommands
+from custom_components.tetraconnect.const import AT_FINAL_RESULTS
+from custom_components.tetraconnect.decoders import DecoderSink
+from custom_components.tetraconnect.motorola import Motorola
+from custom_components.tetraconnect.transmit import TetraTransmitQueue
+
+STATUS_SDS = b"\r\n+CTSDSR: 13,1234567,0,7654321,0,16\r\n800A\r\n"
+
+
+class _Hass:
+    """HA stand-in running background tasks on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+
+    def async_create_background_task(self, target, name):
+        return self.loop.create_task(target)
+
+
+class _Timers:
+    """Timer wheel stand-in, keeping the scheduled keys only."""
+
+    def __init__(self) -> None:
+        self.scheduled: list = []
+
+    def schedule(self, key, delay, action) -> None:
+        self.scheduled.append(key)
+
+    def cancel(self, key) -> None:
+        """Nothing to cancel."""
+
+
+class _CommandSink(DecoderSink):
+    """Hand final result codes to the commands like the coordinator's broker."""
+
+    def __init__(self) -> None:
+        super().__init__("Motorola")
+        self.commands: TetraCommands | None = None
+        self.keys: list[str] = []
+
+    def put(self, key, message) -> None:
+        self.keys.append(key)
+        if key in AT_FINAL_RESULTS:
+            self.commands.handle_result(key, message)
+
+
+async def _send_status(responses: dict[str, bytes]):
+    """Send a status, the radio answers each command with the given response."""
+    loop = asyncio.get_running_loop()
+    sink = _CommandSink()
+    decoder = Motorola(sink)
+    written: list[bytes] = []
+
+    def write(data: bytes) -> bool:
+        written.append(data)
+        command = data.decode("latin-1").split("=", 1)[0]
+        loop.call_soon(decoder.data_handler, responses[command])
+        return True
+
+    sink.commands = TetraCommands(write)
+    queue = TetraTransmitQueue(_Hass(loop), sink.commands.async_command, _Timers())
+    queue.async_start()
+    queue.send_status("1234567", 3)
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if queue.sent or queue.retries:
+            break
+    await queue.async_stop()
+    return queue, sink, written
+
+
+def test_confirmation_completes_sds() -> None:
+    """OK to AT+CMGS confirms the SDS, SDS received meanwhile are decoded."""
+    queue, sink, written = asyncio.run(
+        _send_status(
+            {
+                "AT+CTSDS": STATUS_SDS + b"\r\nOK\r\n",
+                "AT+CMGS": b"\r\n+CMGS: 0,42\r\n\r\nOK\r\n",
+            }
+        )
+    )
+    assert sink.keys == ["+CTSDSR", "OK", "+CMGS", "OK"]
+    assert len(written) == 2
+    assert queue.sent == 1
+    assert queue.retries == 0
+
+
+def test_error_retries_sds_without_timeout() -> None:
+    """+CME ERROR to AT+CMGS fails the SDS right away."""
+    queue, sink, _ = asyncio.run(
+        _send_status(
+            {"AT+CTSDS": b"\r\nOK\r\n", "AT+CMGS": b"\r\n+CME ERROR: 35\r\n"}
+        )
+    )
+    assert sink.keys == ["OK", "+CME ERROR"]
+    assert queue.sent == 0
+    assert queue.retries == 1
+    assert queue.timeouts == 0
+
+
+def test_failed_service_selection_sends_no_sds() -> None:
+    """+CME ERROR to AT+CTSDS fails the SDS before AT+CMGS is sent."""
+    queue, _, written = asyncio.run(
+        _send_status({"AT+CTSDS": b"\r\n+CME ERROR: 35\r\n"})
+    )
+    assert written == [b"AT+CTSDS=13,0\r\n"]
+    assert queue.retries == 1